@@ -0,0 +1,122 @@
+"""Compare the JSON codec backends on Crafty-sized payloads.
+
+Run from the repository root:
+
+    python benchmarks/bench_codec.py
+
+Each payload is decoded into the same models api_helper returns. Backends
+that are not installed are skipped.
+"""
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.codec import BACKENDS, JsonCodec, _available
+from utils.models import LogResponse, ServerInfo, ServerStats
+
+LOG_LINES = 50_000
+SERVERS = 200
+
+def make_log_payload(count):
+    rng = random.Random(1)
+    messages = [
+        "[Server thread/INFO]: Steve joined the game",
+        "[Server thread/INFO]: Alex lost connection: Disconnected",
+        "[Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2113ms or 42 ticks behind",
+        "[Server thread/INFO]: <Steve> has anyone seen my diamonds?",
+        "[Worker-Main-7/INFO]: Preparing spawn area: 84%",
+        "[Server thread/ERROR]: Encountered an unexpected exception\tat net.minecraft.server.MinecraftServer.tick(MinecraftServer.java:871)",
+    ]
+    lines = [
+        f"[{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}] {rng.choice(messages)}"
+        for _ in range(count)
+    ]
+    return json.dumps({"status": "ok", "data": lines}).encode()
+
+def make_server(server_id):
+    return {
+        "server_id": server_id,
+        "created": "2024-03-02T18:21:43",
+        "server_name": f"Survival {server_id}",
+        "path": f"/crafty/servers/{server_id:08x}-4c1e-4b2b-9f0e-2a5d6b8f1c3e",
+        "executable": "paper-1.20.4-435.jar",
+        "log_path": "logs/latest.log",
+        "execution_command": "java -Xms1000M -Xmx4096M -jar paper-1.20.4-435.jar nogui",
+        "auto_start": True,
+        "auto_start_delay": 10,
+        "crash_detection": True,
+        "stop_command": "stop",
+        "executable_update_url": "",
+        "server_ip": "127.0.0.1",
+        "server_port": 25565 + server_id,
+        "logs_delete_after": 0,
+        "type": "minecraft-java",
+        "show_status": True,
+        "created_by": 1,
+        "shutdown_timeout": 60,
+        "ignored_exits": "0",
+        "backup_path": f"/crafty/backups/{server_id:08x}",
+    }
+
+def make_stats_payload(server_id):
+    return json.dumps({"status": "ok", "data": {
+        "stats_id": 123456,
+        "created": "2024-03-02T18:21:43",
+        "server_id": make_server(server_id),
+        "started": "2024-03-02 18:21:43",
+        "running": True,
+        "cpu": 12.5,
+        "mem": "1.6GB",
+        "mem_percent": 20.3,
+        "world_name": "world",
+        "world_size": "185.4MB",
+        "server_port": 25565,
+        "int_ping_results": "True",
+        "online": 3,
+        "max": 20,
+        "players": "['Steve', 'Alex', 'Notch']",
+        "desc": "A Minecraft Server",
+        # Crafty sends the server icon as base64 inside every stats payload
+        "icon": "iVBORw0KGgo" * 600,
+        "version": "1.20.4",
+        "updating": False,
+        "waiting_start": False,
+        "first_run": False,
+        "crashed": False,
+        "importing": False,
+    }}).encode()
+
+def make_server_list_payload(count):
+    return json.dumps({"status": "ok", "data": [make_server(server_id) for server_id in range(1, count + 1)]}).encode()
+
+PAYLOADS = [
+    (f"logs ({LOG_LINES} lines)", make_log_payload(LOG_LINES), lambda lines: LogResponse.from_payload(lines, "1")),
+    ("stats", make_stats_payload(1), lambda stats: ServerStats.from_payload(stats, "1")),
+    (f"server list ({SERVERS} servers)", make_server_list_payload(SERVERS),
+     lambda servers: [ServerInfo.from_payload(server) for server in servers]),
+]
+
+def bench(codec, body, build):
+    runs, _ = timeit.Timer(lambda: codec.decode(body, build)).autorange()
+    return min(timeit.repeat(lambda: codec.decode(body, build), number=runs, repeat=5)) / runs
+
+def main():
+    backends = [name for name in BACKENDS if _available(name)]
+    missing = [name for name in BACKENDS if name not in backends]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+    for label, body, build in PAYLOADS:
+        print(f"\n{label}, {len(body) / 1024:.0f} KiB")
+        baseline = None
+        for name in reversed(backends):
+            seconds = bench(JsonCodec(name), body, build)
+            baseline = baseline or seconds
+            print(f"  {name:<8} {seconds * 1000:9.3f} ms  {baseline / seconds:5.2f}x")
+
+if __name__ == "__main__":
+    main()
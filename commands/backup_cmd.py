@@ -3,7 +3,12 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 from discord.ui import View, Button
-from utils.api_helper import server_action, get_server_stats, get_server_info
+from utils.server_index import server_id_autocomplete
+from utils.rate_limit import rate_limited
+from utils.backup_queue import backup_queue
+from utils.units import format_size
+from utils.planner import RequestPlan, STATS_MAX_AGE
+from utils.progress import send_channel_message
 
 class ConfirmBackupView(View):
     def __init__(self, server_id, server_name):
@@ -67,7 +72,36 @@ class BackupCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def track_job(self, message, job, created):
+        """Keep the message updated with the job's queue position until it finishes"""
+        last_description = None
+        while not job.done.is_set():
+            size = format_size(job.size) if job.size is not None else "Unknown"
+            if job.state == "queued":
+                description = f"Backup of {job.server_name} is queued (position {backup_queue.position(job)} on host `{job.host}`, world size {size})."
+                title = "⏳ Backup Queued"
+            else:
+                description = f"Backup of {job.server_name} is running (world size {size})."
+                title = "💾 Backup Running"
+            if not created:
+                description += "\nA backup of this server was already queued, this request joined it."
+
+            if description != last_description:
+                last_description = description
+                queue_embed = discord.Embed(title=title, description=description, color=discord.Color.blue())
+                queue_embed.set_footer(text=f"At most {backup_queue.max_per_host} backup(s) run per host at once • Order: {backup_queue.policy.replace('_', ' ')}")
+                try:
+                    await message.edit(embed=queue_embed, view=None)
+                except Exception as edit_error:
+                    print(f"Error updating message: {edit_error}")
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+
     @app_commands.command(name="backup", description="Backup a server by providing its server ID.")
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("backup")
     async def backup(self, interaction: discord.Interaction, server_id: str):
         # Defer the response immediately to prevent interaction timeouts
         await interaction.response.defer(ephemeral=False, thinking=True)
@@ -79,25 +113,18 @@ class BackupCommand(commands.Cog):
             backup_path = "Unknown"
             server_executable = "Unknown"
             server_stats = None
+            server_port = None
             
-            try:
-                server_info = get_server_info(server_id)
-                if server_info.get("status") == "ok":
-                    server_data = server_info.get("data", {})
-                    server_name = server_data.get("server_name", f"Server {server_id}")
-                    server_type = server_data.get("type", "Unknown")
-                    backup_path = server_data.get("backup_path", "Unknown")
-                    server_executable = server_data.get("executable", "Unknown")
-                    
-                    # Get additional stats if available
-                    try:
-                        stats_data = get_server_stats(server_id)
-                        if stats_data.get("status") == "ok":
-                            server_stats = stats_data.get("data", {})
-                    except Exception as stats_e:
-                        print(f"Error getting server stats: {stats_e}")
-            except Exception as e:
-                print(f"Error getting server info: {e}")
+            # The stats only add the world size, so a recent cached sample is good enough
+            plan = await RequestPlan(server_id).info().stats(max_age=STATS_MAX_AGE).run()
+            if plan.ok("info"):
+                server_data = plan.data("info")
+                server_name = server_data.server_name
+                server_type = server_data.type
+                backup_path = server_data.backup_path or "Unknown"
+                server_executable = server_data.executable or "Unknown"
+                server_port = server_data.server_port
+                server_stats = plan.data("stats")
             
             # Initial response with warning embed
             warning_embed = discord.Embed(
@@ -110,8 +137,7 @@ class BackupCommand(commands.Cog):
             if server_type != "Unknown" or backup_path != "Unknown":
                 server_meta = f"**Name:** {server_name}\n**Type:** {server_type}\n**Backup Path:** `{backup_path}`"
                 if server_stats:
-                    world_size = server_stats.get("world_size", "Unknown")
-                    server_meta += f"\n**World Size:** {world_size}"
+                    server_meta += f"\n**World Size:** {format_size(server_stats.world_size)}"
                     
                 warning_embed.add_field(
                     name="Server Information",
@@ -171,8 +197,25 @@ class BackupCommand(commands.Cog):
                 except Exception as edit_error:
                     print(f"Error updating message: {edit_error}")
                 
-                # Send backup command to server
-                data = server_action(server_id, "backup_server")
+                # Queue the backup, so big worlds do not all hit the host's disk at once
+                world_size = server_stats.world_size if server_stats else None
+                job, created = backup_queue.submit(server_id, server_name, world_size)
+                if not job.done.is_set():
+                    # A queued backup can outlast the 15 minute interaction token, so follow
+                    # it in a channel message the bot can keep editing
+                    status_message = await send_channel_message(interaction, backup_embed)
+                    if status_message.id != message.id:
+                        try:
+                            await message.edit(embed=discord.Embed(
+                                title="💾 Backup Requested",
+                                description=f"Follow the backup of {server_name} here: {status_message.jump_url}",
+                                color=discord.Color.blue()
+                            ), view=None)
+                        except Exception as edit_error:
+                            print(f"Error updating message: {edit_error}")
+                        message = status_message
+                await self.track_job(message, job, created)
+                data = job.result or {"status": "error", "message": "The backup did not run"}
 
                 if data.get("status") != "ok":
                     # If there's an error, update the message
@@ -189,13 +232,7 @@ class BackupCommand(commands.Cog):
                     return
                 
                 # Fetch current metadata for final response
-                server_metadata = {}
-                try:
-                    stats_after_data = get_server_stats(server_id)
-                    if stats_after_data.get("status") == "ok":
-                        server_metadata = stats_after_data.get("data", {})
-                except Exception as stats_e:
-                    print(f"Error getting server stats after backup: {stats_e}")
+                server_metadata = (await RequestPlan(server_id).stats().run()).data("stats")
 
                 # Final response on successful API call
                 final_embed = discord.Embed(
@@ -209,15 +246,13 @@ class BackupCommand(commands.Cog):
                 
                 # Add stats if available
                 if server_metadata:
-                    if "world_size" in server_metadata:
-                        metadata_field += f"\n**World Size:** {server_metadata.get('world_size', 'Unknown')}"
-                    if "server_port" in server_metadata:
-                        metadata_field += f"\n**Port:** {server_metadata.get('server_port', 'Unknown')}"
-                    if "version" in server_metadata:
-                        metadata_field += f"\n**Version:** {server_metadata.get('version', 'Unknown')}"
-                    if "running" in server_metadata:
-                        status = "🟢 Online" if server_metadata.get("running") else "🔴 Offline"
-                        metadata_field += f"\n**Status:** {status}"
+                    metadata_field += f"\n**World Size:** {format_size(server_metadata.world_size)}"
+                    if server_port:
+                        metadata_field += f"\n**Port:** {server_port}"
+                    if server_metadata.version:
+                        metadata_field += f"\n**Version:** {server_metadata.version}"
+                    status = "🟢 Online" if server_metadata.running else "🔴 Offline"
+                    metadata_field += f"\n**Status:** {status}"
                 
                 final_embed.add_field(
                     name="Server Information",
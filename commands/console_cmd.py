@@ -0,0 +1,91 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.console import run_console_command
+from utils.log_watcher import log_watcher
+from utils.server_index import server_id_autocomplete, server_index
+from utils.rate_limit import rate_limited
+
+# Servers shown as their own embed field; the rest are summarized
+MAX_SERVER_FIELDS = 20
+
+# Extra rate limit tokens for multi-server commands. The base cost (2) plus this
+# must stay below the default user bucket (10), or broadcasts could never run.
+MAX_EXTRA_COST = 6
+
+def console_extra_cost(namespace):
+    """One token per additional server, with a broadcast costing the maximum"""
+    if namespace.server_id == "*":
+        return MAX_EXTRA_COST
+    return min(str(namespace.server_id).count(","), MAX_EXTRA_COST)
+
+def parse_targets(value):
+    """Turn "3", "1,2,5" or "*" (every running server) into a list of server IDs"""
+    value = value.strip()
+    if value == "*":
+        return log_watcher.watched_servers()
+    targets = []
+    for server_id in value.split(","):
+        server_id = server_id.strip()
+        if server_id and server_id not in targets:
+            targets.append(server_id)
+    return targets
+
+class ConsoleCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="console", description="Send a console command to one or more servers (admins only).")
+    @app_commands.describe(
+        server_id="A server ID, a comma-separated list of IDs, or * for every running server",
+        command="The console command, e.g. say Restarting soon or save-all",
+    )
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @rate_limited("console", extra_cost=console_extra_cost)
+    async def console(self, interaction: discord.Interaction, server_id: str, command: str):
+        command = command.strip().lstrip("/")
+        targets = parse_targets(server_id)
+        if not command or not targets:
+            await interaction.response.send_message(
+                "Please give a console command and at least one server ID (no servers are known to be running for `*`).",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(thinking=True)
+
+        results = await run_console_command(targets, command)
+        failed = [result for result in results if not result.ok]
+
+        embed = discord.Embed(
+            title="🖥️ Console Command",
+            description=f"`{command[:200]}` sent to {len(results) - len(failed)}/{len(results)} servers.",
+            color=discord.Color.green() if not failed else (discord.Color.red() if len(failed) == len(results) else discord.Color.gold())
+        )
+
+        for result in results[:MAX_SERVER_FIELDS]:
+            server_name = server_index.get_name(result.server_id) or f"Server {result.server_id}"
+            if result.ok:
+                output = "\n".join(result.output)
+                if len(output) > 950:
+                    output = "...\n" + output[-950:]
+                value = f"✅ Sent\n```{output}```" if output else "✅ Sent, no output logged yet"
+            else:
+                value = f"❌ {result.error}"[:1024]
+            embed.add_field(name=f"{server_name} (ID: {result.server_id})"[:256], value=value, inline=False)
+
+        if len(results) > MAX_SERVER_FIELDS:
+            rest = results[MAX_SERVER_FIELDS:]
+            rest_failed = [result.server_id for result in rest if not result.ok]
+            summary = f"{len(rest) - len(rest_failed)} more servers accepted the command."
+            if rest_failed:
+                summary += f" Failed: {', '.join(rest_failed)}"[:900]
+            embed.add_field(name=f"…and {len(rest)} more", value=summary, inline=False)
+
+        embed.set_footer(text="Output is what the servers logged shortly after the command")
+        await interaction.followup.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(ConsoleCommand(bot))
@@ -0,0 +1,88 @@
+import discord
+import io
+import asyncio
+from discord.ext import commands
+from discord import app_commands
+from utils.stats_history import stats_history, HISTORY_WINDOWS
+from utils.server_index import server_id_autocomplete, server_index
+from utils.rate_limit import rate_limited
+from utils.graphs import render_series_png
+from utils.units import format_size
+
+# metric value -> (label, y axis label, tick formatter)
+GRAPH_METRICS = {
+    "cpu": ("CPU", "CPU %", lambda value: f"{value:.0f}%"),
+    "mem": ("Memory", "Memory", format_size),
+    "mem_percent": ("Memory %", "Memory %", lambda value: f"{value:.0f}%"),
+    "online": ("Players", "Players online", lambda value: f"{value:.0f}"),
+}
+
+class GraphCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="graph", description="Render a chart of a server's CPU, memory or player count.")
+    @app_commands.describe(metric="What to plot", window="How far back to plot")
+    @app_commands.choices(
+        metric=[app_commands.Choice(name=label, value=metric) for metric, (label, _, _) in GRAPH_METRICS.items()],
+        window=[app_commands.Choice(name=name, value=name) for name in HISTORY_WINDOWS],
+    )
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("graph")
+    async def graph(self, interaction: discord.Interaction, server_id: str, metric: str = "cpu", window: str = "1h"):
+        # Rendering can take a moment, so defer first
+        await interaction.response.defer(thinking=True)
+
+        try:
+            server_name = server_index.get_name(server_id) or f"Server {server_id}"
+            history = stats_history.get(server_id)
+            label, ylabel, formatter = GRAPH_METRICS.get(metric, GRAPH_METRICS["cpu"])
+
+            timestamps, values = ([], [])
+            if history is not None:
+                timestamps, values = history.series(metric, HISTORY_WINDOWS.get(window, 3600))
+
+            if len(values) < 2:
+                embed = discord.Embed(
+                    title="📉 Not Enough Data",
+                    description=f"Not enough stats have been collected for {server_name} in the last {window} to draw a graph yet.",
+                    color=discord.Color.gold()
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
+            # Rendering is CPU bound, keep it off the event loop
+            try:
+                png = await asyncio.to_thread(
+                    render_series_png, timestamps, values, f"{server_name} - {label} ({window})", ylabel, formatter
+                )
+            except ImportError:
+                embed = discord.Embed(
+                    title="❌ Graphs Unavailable",
+                    description="Rendering graphs requires `matplotlib`. Install it with `pip install matplotlib`.",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
+            embed = discord.Embed(
+                title=f"📊 {label} for {server_name}",
+                color=discord.Color.blue()
+            )
+            embed.set_image(url="attachment://graph.png")
+            embed.set_footer(text=f"{len(values)} samples over the last {window}")
+            await interaction.followup.send(embed=embed, file=discord.File(io.BytesIO(png), filename="graph.png"))
+
+        except Exception as e:
+            error_embed = discord.Embed(
+                title="⚠️ Error Rendering Graph",
+                description=f"An unexpected error occurred: {str(e)}",
+                color=discord.Color.red()
+            )
+            try:
+                await interaction.followup.send(embed=error_embed)
+            except Exception as followup_error:
+                print(f"Failed to send error message: {followup_error}")
+
+async def setup(bot):
+    await bot.add_cog(GraphCommand(bot))
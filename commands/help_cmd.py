@@ -41,9 +41,13 @@ class HelpView(View):
         embed.add_field(
             name="🔍 Server Information",
             value=(
-                "`/servers` - List all available Minecraft servers\n"
+                "`/servers [status] [server_type] [sort]` - List all available Minecraft servers\n"
                 "`/serverinfo <server_id>` - Get detailed info about a server\n"
-                "`/logs <server_id> [lines]` - Display the last few lines of logs"
+                "`/logs <server_id> [lines] [level] [since] [until] [around]` - Display the last few lines of logs\n"
+                "`/logsearch <server_id> <pattern>` - Search a server's logs\n"
+                "`/history <server_id> [window]` - Show CPU, memory and player trends\n"
+                "`/graph <server_id> [metric] [window]` - Render a chart of a server's stats\n"
+                "`/players <server_id>` - Show who is online and recent sessions"
             ),
             inline=False
         )
@@ -54,7 +58,10 @@ class HelpView(View):
             value=(
                 "`/start <server_id>` - Start a Minecraft server\n"
                 "`/stop <server_id>` - Stop a Minecraft server\n"
-                "`/backup <server_id>` - Create a server backup (Note: Currently limited by Crafty API)"
+                "`/backup <server_id>` - Create a server backup (Note: Currently limited by Crafty API)\n"
+                "`/console <server_id|ids|*> <command>` - Send a console command (admins only)\n"
+                "`/restart <group|ids|*> [batch_size] [concurrency]` - Rolling restart of a group (admins only)\n"
+                "`/stopall [group|ids|*] [kill_after]` - Stop many servers at once (admins only)"
             ),
             inline=False
         )
@@ -127,7 +134,7 @@ class HelpView(View):
                 "2. Create a New Application\n"
                 "3. Navigate to the Bot section\n"
                 "4. Click 'Add Bot'\n"
-                "5. Under 'Privileged Gateway Intents', enable 'Message Content Intent'\n"
+                "5. No privileged intents are needed (enable 'Message Content Intent' only with `\"lean\": false`)\n"
                 "6. Copy the token for use in your config.json"
             ),
             inline=False
@@ -0,0 +1,87 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.stats_history import stats_history, HISTORY_WINDOWS
+from utils.server_index import server_id_autocomplete, server_index
+from utils.rate_limit import rate_limited
+from utils.units import format_size
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+SPARK_WIDTH = 30
+
+def sparkline(values, width=SPARK_WIDTH):
+    """Render values as a unicode sparkline, averaging them down to `width` characters"""
+    if not values:
+        return ""
+    if len(values) > width:
+        step = len(values) / width
+        values = [
+            sum(values[int(i * step):int((i + 1) * step)]) / max(1, int((i + 1) * step) - int(i * step))
+            for i in range(width)
+        ]
+    low, high = min(values), max(values)
+    span = high - low
+    if span <= 0:
+        return SPARK_CHARS[0] * len(values)
+    return "".join(SPARK_CHARS[int((value - low) / span * (len(SPARK_CHARS) - 1))] for value in values)
+
+def describe(values, fmt):
+    return f"**Now:** {fmt(values[-1])} • **Min:** {fmt(min(values))} • **Avg:** {fmt(sum(values) / len(values))} • **Max:** {fmt(max(values))}"
+
+class HistoryCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="history", description="Show resource and player trends of a server.")
+    @app_commands.describe(window="How far back to look (default: 1h)")
+    @app_commands.choices(window=[app_commands.Choice(name=name, value=name) for name in HISTORY_WINDOWS])
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("history")
+    async def history(self, interaction: discord.Interaction, server_id: str, window: str = "1h"):
+        # Everything here is answered from memory, so no need to defer
+        history = stats_history.get(server_id)
+        server_name = server_index.get_name(server_id) or f"Server {server_id}"
+
+        if history is None:
+            embed = discord.Embed(
+                title="📈 No History Yet",
+                description=f"No stats have been collected for {server_name} yet. History is sampled in the background, please try again in a moment.",
+                color=discord.Color.gold()
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+
+        seconds = HISTORY_WINDOWS.get(window, 3600)
+        embed = discord.Embed(
+            title=f"📈 History for {server_name} ({window})",
+            color=discord.Color.blue()
+        )
+
+        metrics = (
+            ("🖥️ CPU", "cpu", lambda value: f"{value:.1f}%"),
+            ("🧠 Memory", "mem", format_size),
+            ("👥 Players", "online", lambda value: f"{value:.0f}"),
+            ("🌍 World Size", "world_size", format_size),
+        )
+        points = 0
+        for label, metric, fmt in metrics:
+            timestamps, values = history.series(metric, seconds)
+            if not values:
+                continue
+            points = max(points, len(values))
+            embed.add_field(
+                name=label,
+                value=f"`{sparkline(values)}`\n{describe(values, fmt)}",
+                inline=False
+            )
+
+        if not points:
+            embed.description = "No samples in this time window yet."
+            embed.color = discord.Color.gold()
+        else:
+            embed.set_footer(text=f"{points} data points • Use /serverinfo {server_id} for current details")
+
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(HistoryCommand(bot))
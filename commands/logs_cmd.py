@@ -1,44 +1,94 @@
 import discord
+import asyncio
+import io
 from discord.ext import commands
 from discord import app_commands
-from utils.api_helper import get_server_logs, get_server_stats, get_server_info
+from utils.server_index import server_id_autocomplete
+from utils.rate_limit import rate_limited
+from utils.log_parser import log_cache, LogRecord, LEVEL_RANK
+from utils.log_export import compress_log_lines, DEFAULT_UPLOAD_LIMIT
+from utils.pagination import PagedView
+from utils.planner import RequestPlan, STATS_MAX_AGE
+
+# Half-width of the window shown for the `around` option
+AROUND_WINDOW = 120
+
+# Characters of log text shown in the embed; longer output is attached as .log.gz
+EMBED_TEXT_LIMIT = 3950
+
+# Most entries shown on one page of the /logs pager
+MAX_PAGE_ENTRIES = 25
+
+# One extra rate limit token per 100 requested lines, capped so that the base
+# cost (2) plus the extra stays below the default user bucket (10)
+LINES_PER_TOKEN = 100
+MAX_EXTRA_COST = 6
+
+# Largest `lines` value accepted; bigger tails are attached as .log.gz anyway
+MAX_LINES = 100000
+
+def logs_extra_cost(namespace):
+    return max(0, min((namespace.lines or 0) // LINES_PER_TOKEN, MAX_EXTRA_COST))
+
+def tail_text(lines, limit):
+    """Join the newest lines that fit in `limit` characters. Returns (text, truncated)."""
+    taken = []
+    used = 0
+    for line in reversed(lines):
+        if used + len(line) + 1 > limit:
+            if not taken:
+                taken.append(line[-limit:])
+            return "\n".join(reversed(taken)), True
+        taken.append(line)
+        used += len(line) + 1
+    return "\n".join(reversed(taken)), False
 
 class LogsCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    @staticmethod
+    def resolve_window(parsed, since, until, around):
+        """Turn the since/until/around options into an absolute (start, end) log time window"""
+        if around:
+            center = parsed.resolve_time_spec(around)
+            if center is None:
+                return None
+            return center - AROUND_WINDOW, center + AROUND_WINDOW
+        start = parsed.resolve_time_spec(since) if since else None
+        end = parsed.resolve_time_spec(until) if until else None
+        if (since and start is None) or (until and end is None):
+            return None
+        return start, end
+
     @app_commands.command(
         name="logs",
         description="Display the last few lines of a server's logs by providing its server ID.",
     )
-    async def logs(self, interaction: discord.Interaction, server_id: str, lines: int = 15):
+    @app_commands.describe(
+        lines="Newest lines or entries to show (1-100000); each 100 cost one more rate limit token, up to 6 extra",
+        level="Only show entries at this level or more severe",
+        since="Only entries after this time: a duration ago like 10m, or a time like 14:30",
+        until="Only entries before this time: a duration ago like 5m, or a time like 14:45",
+        around="Show entries around this time, e.g. 14:32:10 or 30m",
+    )
+    @app_commands.choices(level=[
+        app_commands.Choice(name=level, value=level) for level in ("DEBUG", "INFO", "WARN", "ERROR")
+    ])
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("logs", extra_cost=logs_extra_cost)
+    async def logs(self, interaction: discord.Interaction, server_id: str, lines: app_commands.Range[int, 1, MAX_LINES] = 15, level: str = None,
+                   since: str = None, until: str = None, around: str = None):
         # Defer the response to prevent timeout issues
         await interaction.response.defer(thinking=True)
         
         try:
-            # First check if the server exists and is online
-            server_exists = False
-            server_online = False
-            server_name = f"Server {server_id}"
-            
-            # Verify the server exists
-            try:
-                server_info = get_server_info(server_id)
-                if server_info.get("status") == "ok":
-                    server_exists = True
-                    server_name = server_info.get("data", {}).get("server_name", f"Server {server_id}")
-            except Exception as e:
-                print(f"Error checking server existence: {e}")
-            
-            # Check if the server is online
-            if server_exists:
-                try:
-                    stats_data = get_server_stats(server_id)
-                    if stats_data.get("status") == "ok":
-                        stats = stats_data.get("data", {})
-                        server_online = stats.get("running", False)
-                except Exception as e:
-                    print(f"Error checking server status: {e}")
+            # Existence, status and the logs themselves are fetched at the same time; the
+            # logs are skipped (or dropped) when the stats show the server is offline
+            plan = await RequestPlan(server_id).info().stats(max_age=STATS_MAX_AGE).logs(only_if_running=True).run()
+            server_exists = plan.ok("info")
+            server_name = plan.data("info").server_name if server_exists else f"Server {server_id}"
+            server_online = plan.ok("stats") and plan.data("stats").running
             
             # If server doesn't exist, return an error
             if not server_exists:
@@ -61,8 +111,7 @@ class LogsCommand(commands.Cog):
                 await interaction.followup.send(embed=offline_embed)
                 return
             
-            # Server exists and is online, get the logs
-            data = get_server_logs(server_id)
+            data = plan.response("logs")
             
             # Determine color based on server status (should be green since we already checked it's online)
             embed_color = discord.Color.green()
@@ -73,26 +122,94 @@ class LogsCommand(commands.Cog):
                 color=embed_color
             )
             
+            attachment = None
+            view = None
             if data.get("status") == "ok":
-                log_lines = data.get("data", [])
-                if log_lines:
-                    # Show the specified number of lines (default 15)
-                    log_text = "\n".join(log_lines[-lines:])
-                    # Truncate if too long for Discord embed (max 4096 characters)
-                    if len(log_text) > 4000:
-                        log_text = log_text[-4000:]
-                        log_text = "...(truncated)...\n" + log_text
-                    
-                    embed.description = f"```{log_text}```"
-                    embed.set_footer(text=f"Showing last {min(lines, len(log_lines))} lines")
+                log_lines = data["data"].lines
+                time_query = since or until or around
+                scope = ""
+                if log_lines and (level or time_query):
+                    # Parse only what was appended since the last call and answer from the indexes
+                    parsed, _ = await asyncio.to_thread(log_cache.update, server_id, log_lines)
+                    if time_query:
+                        window = self.resolve_window(parsed, since, until, around)
+                        if window is None:
+                            embed.description = "Could not understand the time filter. Use a duration like `10m` or `1h30m`, or a time like `14:30` or `14:30:15`."
+                            embed.color = discord.Color.red()
+                            await interaction.followup.send(embed=embed)
+                            return
+                        entries = parsed.between(*window)
+                        if level:
+                            rank = LEVEL_RANK.get(level, 0)
+                            entries = [record for record in entries if LEVEL_RANK.get(record.level, -1) >= rank]
+                        scope = " in the time window"
+                    else:
+                        entries = await asyncio.to_thread(parsed.by_level, level)
+                    if level:
+                        scope += f" at {level} or above"
+                    render = LogRecord.text
+                    unit = "Entries"
+                elif log_lines:
+                    entries = log_lines
+                    render = None
+                    unit = "Lines"
                 else:
+                    entries = None
                     embed.description = "No logs available for this server even though it's online. This may happen if the server just started or if there's an issue with the log system."
                     embed.color = discord.Color.gold()
+
+                if entries:
+                    # The last `lines` entries are the requested output; if they do not fit in
+                    # an embed they are attached as a gzipped file, streamed instead of joined
+                    selected = entries[-lines:]
+                    if render:
+                        selected = [render(entry) for entry in selected]
+                    attachment_note = ""
+                    if tail_text(selected, EMBED_TEXT_LIMIT)[1]:
+                        upload_limit = interaction.guild.filesize_limit if interaction.guild else DEFAULT_UPLOAD_LIMIT
+                        gz_data, _, count = await asyncio.to_thread(compress_log_lines, selected, upload_limit)
+                        attachment = discord.File(io.BytesIO(gz_data), filename=f"logs-{server_id}.log.gz".replace(":", "-"))
+                        attachment_note = f" • Last {count} attached"
+
+                    # Page through the snapshot without going back to Crafty. Pages are
+                    # aligned to the end so the newest page is always full.
+                    page_size = max(1, min(lines, MAX_PAGE_ENTRIES))
+                    page_count = -(-len(entries) // page_size)
+
+                    def build_page(index):
+                        end = len(entries) - (page_count - 1 - index) * page_size
+                        start = max(0, end - page_size)
+                        texts = entries[start:end]
+                        if render:
+                            texts = [render(entry) for entry in texts]
+                        log_text, truncated = tail_text(texts, EMBED_TEXT_LIMIT)
+                        if truncated:
+                            log_text = "...(truncated)...\n" + log_text
+                        page = discord.Embed(title=embed.title, description=f"```{log_text}```", color=embed.color)
+                        page.set_footer(text=f"{unit} {start + 1}-{end} of {len(entries)}{scope}{attachment_note}")
+                        return page
+
+                    if page_count > 1:
+                        view = PagedView(page_count, build_page, start_page=page_count - 1, owner_id=interaction.user.id)
+                        embed = view.current_embed()
+                    else:
+                        embed = build_page(0)
+                elif entries is not None:
+                    embed.description = "No log entries match these filters."
+                    embed.color = discord.Color.light_gray()
             else:
                 embed.description = f"Failed to retrieve logs for server `{server_id}`. Error: {data.get('message', 'Unknown error')}"
                 embed.color = discord.Color.red()
-                
-            await interaction.followup.send(embed=embed)
+
+            send_kwargs = {"embed": embed}
+            if attachment is not None:
+                send_kwargs["file"] = attachment
+            if view is not None:
+                send_kwargs["view"] = view
+            message = await interaction.followup.send(wait=True, **send_kwargs)
+            if view is not None:
+                # Store the message reference in the view for timeout handling
+                view.message = message
                 
         except Exception as e:
             error_embed = discord.Embed(
@@ -0,0 +1,133 @@
+import re
+import asyncio
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.api_helper import get_server_logs
+from utils.server_index import server_id_autocomplete, server_index
+from utils.rate_limit import rate_limited
+from utils.log_search import compile_pattern, search_lines
+
+# Upper bounds users cannot raise
+MAX_MATCHES = 50
+MAX_CONTEXT = 5
+SEARCH_TIME_BUDGET = 3.0
+MAX_PATTERN_LENGTH = 200
+
+def _shorten(line, width):
+    return line if len(line) <= width else line[:width - 1] + "…"
+
+def format_matches(result, limit=3900):
+    """Render matches as numbered lines, marking matching lines with '>'.
+
+    A first match too long for the limit on its own (e.g. a huge line) is
+    cut down, giving each of its lines an equal share, so the reply is never
+    empty.
+    """
+    blocks = []
+    length = 0
+    shown = 0
+    for line_number, context in result.matches:
+        lines = [f"{'>' if number == line_number else ' '}{number:>6} | {line}" for number, line in context]
+        block = "\n".join(lines)
+        if not blocks and len(block) > limit:
+            width = max(1, limit // len(lines) - 1)
+            block = "\n".join(_shorten(line, width) for line in lines)[:limit]
+        if length + len(block) + 5 > limit and blocks:
+            break
+        blocks.append(block)
+        length += len(block) + 5
+        shown += 1
+    return "\n---\n".join(blocks), shown
+
+class LogSearchCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="logsearch", description="Search a server's logs for a text or regular expression.")
+    @app_commands.describe(
+        pattern="Text to look for (or a regular expression if regex is enabled)",
+        regex="Treat the pattern as a regular expression (admins only)",
+        context="Lines of context around each match (0-5)",
+        max_matches="Maximum number of matches to show (1-50)",
+    )
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("logsearch")
+    async def logsearch(self, interaction: discord.Interaction, server_id: str, pattern: str,
+                        regex: bool = False, context: int = 1, max_matches: int = 20):
+        # The time budget is only checked between lines, and a backtracking regex can stall
+        # on a single line of player chat. Only admins may run arbitrary expressions.
+        if regex and not interaction.permissions.administrator:
+            await interaction.response.send_message("❌ Regular expression search is limited to administrators.", ephemeral=True)
+            return
+        if len(pattern) > MAX_PATTERN_LENGTH:
+            await interaction.response.send_message(f"❌ Patterns are limited to {MAX_PATTERN_LENGTH} characters.", ephemeral=True)
+            return
+        await interaction.response.defer(thinking=True)
+
+        try:
+            server_name = server_index.get_name(server_id) or f"Server {server_id}"
+            context = max(0, min(context, MAX_CONTEXT))
+            max_matches = max(1, min(max_matches, MAX_MATCHES))
+
+            try:
+                compiled = compile_pattern(pattern, regex)
+            except re.error as e:
+                error_embed = discord.Embed(
+                    title="❌ Invalid Pattern",
+                    description=f"`{pattern}` is not a valid regular expression: {e}",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=error_embed)
+                return
+
+            data = await asyncio.to_thread(get_server_logs, server_id)
+            if data.get("status") != "ok":
+                error_embed = discord.Embed(
+                    title="❌ Failed to Retrieve Logs",
+                    description=f"Could not get logs for {server_name}. Error: {data.get('message', 'Unknown error')}",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=error_embed)
+                return
+
+            # Large logs are scanned in a worker thread so the bot stays responsive
+            log_lines = data["data"].lines
+            result = await asyncio.to_thread(
+                search_lines, log_lines, compiled, max_matches, context, SEARCH_TIME_BUDGET
+            )
+
+            embed = discord.Embed(
+                title=f"🔎 Log Search in {server_name}",
+                color=discord.Color.blue()
+            )
+            if result.matches:
+                text, shown = format_matches(result)
+                embed.description = f"```{text}```"
+                footer = f"Showing {shown} of {len(result.matches)} matches • Scanned {result.scanned}/{result.total} lines"
+            else:
+                embed.description = f"No lines matching `{pattern}` found."
+                embed.color = discord.Color.light_gray()
+                footer = f"Scanned {result.scanned}/{result.total} lines"
+
+            if result.hit_match_limit:
+                footer += f" • Stopped at {max_matches} matches"
+            if result.timed_out:
+                footer += " • Stopped early, search took too long"
+            embed.set_footer(text=footer)
+
+            await interaction.followup.send(embed=embed)
+
+        except Exception as e:
+            error_embed = discord.Embed(
+                title="⚠️ Error Searching Logs",
+                description=f"An unexpected error occurred: {str(e)}",
+                color=discord.Color.red()
+            )
+            try:
+                await interaction.followup.send(embed=error_embed)
+            except Exception as followup_error:
+                print(f"Failed to send error message: {followup_error}")
+
+async def setup(bot):
+    await bot.add_cog(LogSearchCommand(bot))
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timezone
+import discord
+from discord.ext import commands
+from discord import app_commands
+from utils.player_sessions import player_sessions
+from utils.server_index import server_id_autocomplete, server_index
+from utils.rate_limit import rate_limited
+
+def format_duration(seconds):
+    """Format seconds as e.g. 2h 05m or 4m 10s"""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds:02d}s"
+
+class PlayersCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="players", description="Show who is online on a server and recent player sessions.")
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("players")
+    async def players(self, interaction: discord.Interaction, server_id: str):
+        # Answered from the log watcher's session index, no Crafty calls needed
+        server_name = server_index.get_name(server_id) or f"Server {server_id}"
+        players = player_sessions.get(server_id)
+
+        if players is None:
+            embed = discord.Embed(
+                title="👥 No Player Data Yet",
+                description=f"No player activity has been seen for {server_name} yet. Player sessions are tracked from the logs of running servers.",
+                color=discord.Color.gold()
+            )
+            await interaction.response.send_message(embed=embed)
+            return
+
+        now = time.time()
+        embed = discord.Embed(
+            title=f"👥 Players on {server_name}",
+            color=discord.Color.green() if players.online else discord.Color.blue()
+        )
+
+        if players.online:
+            online = sorted(players.online.values(), key=lambda session: session.joined)
+            embed.add_field(
+                name=f"🟢 Online ({len(online)})",
+                value="\n".join(
+                    f"**{session.name}** - {format_duration(session.duration(now))}"
+                    for session in online[:25]
+                )[:1024],
+                inline=False
+            )
+        else:
+            embed.add_field(name="🟢 Online (0)", value="Nobody is online right now.", inline=False)
+
+        if players.recent_joins:
+            embed.add_field(
+                name="🚪 Recent Joins",
+                value="\n".join(
+                    f"**{name}** {discord.utils.format_dt(datetime.fromtimestamp(joined, tz=timezone.utc), 'R')}"
+                    for name, joined in reversed(list(players.recent_joins)[-10:])
+                )[:1024],
+                inline=True
+            )
+
+        if players.recent_sessions:
+            embed.add_field(
+                name="⏱️ Recent Sessions",
+                value="\n".join(
+                    f"**{session.name}** - {format_duration(session.duration())}"
+                    + (f" ({session.reason})" if session.reason else "")
+                    for session in reversed(list(players.recent_sessions)[-10:])
+                )[:1024],
+                inline=True
+            )
+
+        embed.set_footer(text=f"{players.total_sessions} finished sessions tracked • Updated from the server log")
+        await interaction.response.send_message(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(PlayersCommand(bot))
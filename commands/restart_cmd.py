@@ -0,0 +1,118 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+from utils.api_helper import server_action, get_server_logs, get_server_stats, load_config
+from utils.server_groups import resolve_targets, targets_autocomplete
+from utils.readiness import wait_until_ready, wait_until_stopped
+from utils.progress import ProgressBoard
+from utils.rate_limit import rate_limited
+from utils.alerts import alert_manager
+
+class RestartCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        restart_config = load_config().get("restart", {})
+        self.batch_size = restart_config.get("batch_size", 1)
+        self.max_concurrent_boots = restart_config.get("max_concurrent_boots", 2)
+        self.max_failures = restart_config.get("max_failures", 1)
+        self.stop_timeout = restart_config.get("stop_timeout_seconds", 90)
+        self.start_timeout = restart_config.get("start_timeout_seconds", 180)
+
+    async def restart_one(self, board, server_id, boot_limit):
+        """Stop a server, wait for it to go down, then start it and wait for "Done". Returns success."""
+        try:
+            stats_data = await asyncio.to_thread(get_server_stats, server_id)
+            if stats_data.get("status") != "ok":
+                board.set(server_id, f"❌ {stats_data.get('message', 'Unknown error')}"[:100])
+                return False
+            if not stats_data["data"].running:
+                # Restarting must not bring up servers that were meant to be down
+                board.set(server_id, "⏭️ Offline, skipped")
+                return True
+
+            # Remember the current log so the previous run's "Done" line is not mistaken for readiness
+            logs_data = await asyncio.to_thread(get_server_logs, server_id)
+            before_lines = logs_data["data"].lines if logs_data.get("status") == "ok" else None
+
+            board.set(server_id, "🛑 Stopping")
+            alert_manager.expect_stop(server_id)
+            data = await asyncio.to_thread(server_action, server_id, "stop_server")
+            if data.get("status") != "ok":
+                board.set(server_id, f"❌ Stop failed: {data.get('message', 'Unknown error')}"[:100])
+                return False
+            if not await wait_until_stopped(server_id, timeout=self.stop_timeout):
+                board.set(server_id, "❌ Did not stop in time")
+                return False
+
+            # Only a few servers boot at once so the host's CPU and disk are not swamped
+            board.set(server_id, "⏳ Waiting to boot")
+            async with boot_limit:
+                board.set(server_id, "🚀 Starting")
+                data = await asyncio.to_thread(server_action, server_id, "start_server")
+                if data.get("status") != "ok":
+                    board.set(server_id, f"❌ Start failed: {data.get('message', 'Unknown error')}"[:100])
+                    return False
+                if await wait_until_ready(server_id, timeout=self.start_timeout, before_lines=before_lines):
+                    board.set(server_id, "✅ Ready")
+                    return True
+                board.set(server_id, "❌ Not ready in time")
+                return False
+        except Exception as e:
+            print(f"Error restarting server {server_id}: {e}")
+            board.set(server_id, "❌ Error, see bot logs")
+            return False
+
+    @app_commands.command(name="restart", description="Restart a group of servers in batches, waiting for each batch to be ready (admins only).")
+    @app_commands.describe(
+        target="A server group from config.json, a comma-separated list of server IDs, or * for all servers",
+        batch_size="Servers restarted at the same time (default from config, usually 1)",
+        concurrency="Servers allowed to boot at the same time within a batch",
+        max_failures="Abort after this many servers fail to restart",
+    )
+    @app_commands.autocomplete(target=targets_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @rate_limited("restart")
+    async def restart(self, interaction: discord.Interaction, target: str,
+                      batch_size: app_commands.Range[int, 1, 50] = None,
+                      concurrency: app_commands.Range[int, 1, 50] = None,
+                      max_failures: app_commands.Range[int, 1, 100] = None):
+        targets = resolve_targets(target)
+        if not targets:
+            await interaction.response.send_message(f"No servers found for `{target}`.", ephemeral=True)
+            return
+
+        batch_size = batch_size or self.batch_size
+        max_failures = max_failures or self.max_failures
+        boot_limit = asyncio.Semaphore(concurrency or self.max_concurrent_boots)
+        batches = [targets[i:i + batch_size] for i in range(0, len(targets), batch_size)]
+
+        await interaction.response.defer(thinking=True)
+        board = ProgressBoard(interaction, f"🔁 Rolling Restart: {target}"[:256], targets)
+        await board.start()
+
+        failures = 0
+        aborted = False
+        for number, batch in enumerate(batches, 1):
+            board.note(f"Batch {number}/{len(batches)}: restarting {len(batch)} server(s)")
+            results = await asyncio.gather(*(self.restart_one(board, server_id, boot_limit) for server_id in batch))
+            failures += results.count(False)
+            if failures >= max_failures and number < len(batches):
+                # Stop here so a bad plugin update does not take down the whole group
+                for remaining in batches[number:]:
+                    for server_id in remaining:
+                        board.set(server_id, "⏭️ Not restarted")
+                board.note(f"🛑 Aborted after {failures} failure(s), the remaining servers were left running")
+                aborted = True
+                break
+
+        if aborted:
+            await board.finish("🛑 Rolling Restart Aborted", discord.Color.red(), "Fix the failed servers and run /restart again")
+        elif failures:
+            await board.finish("⚠️ Rolling Restart Finished With Failures", discord.Color.gold(), f"{failures} server(s) failed")
+        else:
+            await board.finish("✅ Rolling Restart Complete", discord.Color.green(), f"{len(targets)} server(s) processed")
+
+async def setup(bot):
+    await bot.add_cog(RestartCommand(bot))
@@ -1,7 +1,9 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.api_helper import get_server_info, get_server_stats
+from utils.server_index import server_id_autocomplete
+from utils.rate_limit import rate_limited
+from utils.planner import RequestPlan, STATS_MAX_AGE
 
 class ServerInfoCommand(commands.Cog):
     def __init__(self, bot):
@@ -10,37 +12,34 @@ class ServerInfoCommand(commands.Cog):
     @app_commands.command(
         name="serverinfo", description="Get details of a server. Provide the server ID."
     )
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("serverinfo")
     async def serverinfo(self, interaction: discord.Interaction, server_id: str):
         # Defer the response to prevent timeout
         await interaction.response.defer(thinking=True)
         
         try:
-            # Get server info
-            data = get_server_info(server_id)
+            # Get server info and status at the same time
+            plan = await RequestPlan(server_id).info().stats(max_age=STATS_MAX_AGE).run()
+            data = plan.response("info")
 
             if data.get("status") == "ok":
-                server = data.get("data", {})
+                server = data["data"]
 
                 # Get server status
                 status = "⚠️ Unknown"
                 embed_color = discord.Color.gold()  
                 # Default to yellow/gold for unknown
-                try:
-                    stats_data = get_server_stats(server_id)
-                    if stats_data.get("status") == "ok":
-                        stats = stats_data.get("data", {})
-                        if stats.get("running", False):
-                            status = "🟢 Online"
-                            embed_color = discord.Color.green()
-                        else:
-                            status = "🔴 Offline"
-                            embed_color = discord.Color.red()
-                except:
-                    status = "⚠️ Status Unavailable"
-                    embed_color = discord.Color.gold()
+                if plan.ok("stats"):
+                    if plan.data("stats").running:
+                        status = "🟢 Online"
+                        embed_color = discord.Color.green()
+                    else:
+                        status = "🔴 Offline"
+                        embed_color = discord.Color.red()
 
                 # Get public server IP address
-                public_server_ip = server.get('server_ip')
+                public_server_ip = server.server_ip
                 if (
                     public_server_ip == "127.0.0.1"
                     or public_server_ip == "localhost"
@@ -50,18 +49,18 @@ class ServerInfoCommand(commands.Cog):
 
                 # Get internal server IP address
                 if public_server_ip == "Failed to retrieve public IP address":
-                    internal_server_ip = server.get('server_ip')
+                    internal_server_ip = server.server_ip
 
                 # Create embed
                 embed = discord.Embed(
-                    title=f"Server Information: {server.get('server_name')}",
+                    title=f"Server Information: {server.server_name}",
                     description="Detailed information about this Minecraft server:",
                     color=embed_color
                 )
 
                 # Add fields
-                embed.add_field(name="🆔 Server ID", value=server.get('server_id'), inline=True)
-                embed.add_field(name="🏷️ Server Type", value=server.get('type'), inline=True)
+                embed.add_field(name="🆔 Server ID", value=server.server_id, inline=True)
+                embed.add_field(name="🏷️ Server Type", value=server.type, inline=True)
                 embed.add_field(name="🔌 Status", value=status, inline=True)
                 if public_server_ip == "Failed to retrieve public IP address":
                     embed.add_field(
@@ -77,7 +76,7 @@ class ServerInfoCommand(commands.Cog):
                     embed.add_field(
                         name="🌐 Internal IP Address", value="Cannot get Internal IP!", inline=True
                     )
-                embed.add_field(name="🔢 Port", value=server.get('server_port'), inline=True)
+                embed.add_field(name="🔢 Port", value=server.server_port, inline=True)
 
                 embed.set_footer(text="Use /start or /stop to control this server")
 
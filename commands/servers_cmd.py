@@ -1,91 +1,169 @@
 import discord
+import asyncio
 from discord.ext import commands
 from discord import app_commands
-from utils.api_helper import get_all_servers, get_server_stats
+from utils.api_helper import get_all_servers, get_server_stats, load_config
+from utils.server_index import server_index
+from utils.stats_history import stats_history
+from utils.rate_limit import rate_limited
+from utils.pagination import PagedView
+
+# Cached stats younger than this are used instead of asking Crafty again
+STATS_CACHE_MAX_AGE = load_config().get("stats_cache_max_age_seconds", 120)
+
+# Servers per page; each server is one embed field (Discord allows 25)
+SERVERS_PER_PAGE = 10
+
+# Concurrent stats requests for servers the collector has no recent sample of
+MAX_STATS_FETCHES = 8
+
+STATUS_ONLINE = "🟢 Online"
+STATUS_OFFLINE = "🔴 Offline"
+STATUS_UNKNOWN = "❓ Unknown"
+STATUS_UNAVAILABLE = "⚠️ Status Unavailable, is the Server unloaded?"
+
+SORT_KEYS = {
+    "name": lambda entry: entry[0].server_name.casefold(),
+    "status": lambda entry: (entry[1] != STATUS_ONLINE, entry[0].server_name.casefold()),
+    "type": lambda entry: (entry[0].type.casefold(), entry[0].server_name.casefold()),
+}
+
+def status_color(statuses):
+    """Pick the embed color for a set of server statuses"""
+    has_online = STATUS_ONLINE in statuses
+    has_offline = STATUS_OFFLINE in statuses
+    has_unknown = bool(statuses - {STATUS_ONLINE, STATUS_OFFLINE})
+
+    if has_online and not has_offline and not has_unknown:
+        # All servers are online
+        return discord.Color.green()
+    elif has_offline and not has_online and not has_unknown:
+        # All servers are offline
+        return discord.Color.red()
+    elif has_unknown and not has_online and not has_offline:
+        # All servers are unknown
+        return discord.Color.gold()
+    elif has_online:
+        # Mixed status but at least one online
+        return discord.Color.green()
+    elif has_offline:
+        # Mixed status but all offline
+        return discord.Color.red()
+    # Fallback
+    return discord.Color.gold()
+
+async def fetch_statuses(servers):
+    """Status of every server, from cached stats where possible and concurrent requests otherwise"""
+    limit = asyncio.Semaphore(MAX_STATS_FETCHES)
+
+    async def fetch_one(server_id):
+        # Use the background collector's (or restored) stats when recent enough
+        cached = stats_history.get_latest(server_id, max_age=STATS_CACHE_MAX_AGE)
+        try:
+            if cached is not None:
+                stats_data = {"status": "ok", "data": cached[1]}
+            else:
+                async with limit:
+                    stats_data = await asyncio.to_thread(get_server_stats, server_id)
+            if stats_data.get("status") == "ok":
+                return STATUS_ONLINE if stats_data["data"].running else STATUS_OFFLINE
+            if stats_data.get("error") == "UNAVAILABLE":
+                return STATUS_UNAVAILABLE
+            return STATUS_UNKNOWN
+        except Exception as e:
+            print(f"Error getting server stats: {e}")
+            return STATUS_UNAVAILABLE
+
+    return await asyncio.gather(*(fetch_one(server.server_id) for server in servers))
 
 class ServersCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        
+
     @app_commands.command(name="servers", description="List all available Minecraft servers")
-    async def servers(self, interaction: discord.Interaction):
+    @app_commands.describe(
+        status="Only list online or offline servers",
+        server_type="Only list servers whose type contains this text, e.g. java or bedrock",
+        sort="Order of the list (default: as Crafty returns it)",
+    )
+    @app_commands.choices(
+        status=[
+            app_commands.Choice(name="Online", value="online"),
+            app_commands.Choice(name="Offline", value="offline"),
+        ],
+        sort=[
+            app_commands.Choice(name="Name", value="name"),
+            app_commands.Choice(name="Status", value="status"),
+            app_commands.Choice(name="Type", value="type"),
+        ],
+    )
+    @rate_limited("servers")
+    async def servers(self, interaction: discord.Interaction, status: str = None, server_type: str = None,
+                      sort: str = None):
         # Defer the response to prevent timeout
         await interaction.response.defer(thinking=True)
-        
+
         try:
-            data = get_all_servers()
-            
+            # Queries every configured panel concurrently, so keep it off the event loop
+            data = await asyncio.to_thread(get_all_servers)
+
             if data.get("status") == "ok":
                 servers = data.get("data", [])
-                if servers:
+                # We already paid for the full list, so refresh the autocomplete index with it
+                server_index.rebuild(servers)
+                if not servers:
+                    await interaction.followup.send("No servers found.")
+                    return
+
+                # One snapshot of the fleet; the pages below are built from it on demand
+                entries = list(zip(servers, await fetch_statuses(servers)))
+                if status == "online":
+                    entries = [entry for entry in entries if entry[1] == STATUS_ONLINE]
+                elif status == "offline":
+                    entries = [entry for entry in entries if entry[1] == STATUS_OFFLINE]
+                if server_type:
+                    needle = server_type.casefold()
+                    entries = [entry for entry in entries if needle in entry[0].type.casefold()]
+                if sort in SORT_KEYS:
+                    entries.sort(key=SORT_KEYS[sort])
+
+                if not entries:
+                    await interaction.followup.send("No servers match these filters.")
+                    return
+
+                online_count = sum(1 for _, server_status in entries if server_status == STATUS_ONLINE)
+                color = status_color({server_status for _, server_status in entries})
+                page_count = -(-len(entries) // SERVERS_PER_PAGE)
+                footer = "Use /serverinfo <id> for more details"
+                if data.get("errors"):
+                    footer += f" • Unreachable panels: {', '.join(data['errors'])}"
+
+                def build_page(index):
                     # Create a nice embed for the servers
                     embed = discord.Embed(
                         title="Available Minecraft Servers",
-                        description="Here are all available servers from Crafty Controller:",
-                        color=discord.Color.blue()
+                        description=f"Here are all available servers from Crafty Controller ({online_count}/{len(entries)} online):",
+                        color=color
                     )
-
-                    # Track overall status for embed color
-                    has_online = False
-                    has_offline = False
-                    has_unknown = False
-
-                    # Add server information to embed
-                    for server in servers:
-                        server_name = server.get('server_name')
-                        server_id = server.get('server_id')
-                        server_type = server.get('type')
-
-                        # Get server status if possible (running or offline or unk)
-                        status = "❓ Unknown"
-                        try:
-                            stats_data = get_server_stats(server_id)
-                            if stats_data.get("status") == "ok":
-                                stats = stats_data.get("data", {})
-                                if stats.get("running", False):
-                                    status = "🟢 Online"
-                                    has_online = True
-                                else:
-                                    status = "🔴 Offline"
-                                    has_offline = True
-                            else:
-                                has_unknown = True
-                        except Exception as e:
-                            status = "⚠️ Status Unavailable, is the Server unloaded?"
-                            has_unknown = True
-                            print(f"Error getting server stats: {e}")
-
-                        # Add field for each server
+                    for server, server_status in entries[index * SERVERS_PER_PAGE:(index + 1) * SERVERS_PER_PAGE]:
                         embed.add_field(
-                            name=f"Name: {server_name} | ID: *{server_id}*",
-                            value=f"**Type:** {server_type}\n**Status:** {status}",
+                            name=f"Name: {server.server_name} | ID: *{server.server_id}*"[:256],
+                            value=f"**Type:** {server.type}\n**Status:** {server_status}",
                             inline=False,
                         )
+                    page_footer = footer
+                    if page_count > 1:
+                        page_footer = f"Page {index + 1}/{page_count} • {footer}"
+                    embed.set_footer(text=page_footer[:2048])
+                    return embed
 
-                    # Set the embed color based on server statuses
-                    if has_online and not has_offline and not has_unknown:
-                        # All servers are online
-                        embed.color = discord.Color.green()
-                    elif has_offline and not has_online and not has_unknown:
-                        # All servers are offline
-                        embed.color = discord.Color.red()
-                    elif has_unknown and not has_online and not has_offline:
-                        # All servers are unknown
-                        embed.color = discord.Color.gold()
-                    elif has_online:
-                        # Mixed status but at least one online
-                        embed.color = discord.Color.green()
-                    elif has_offline:
-                        # Mixed status but all offline
-                        embed.color = discord.Color.red()
-                    else:
-                        # Fallback
-                        embed.color = discord.Color.gold()
-
-                    embed.set_footer(text="Use /serverinfo <id> for more details")
-                    await interaction.followup.send(embed=embed)
+                if page_count > 1:
+                    view = PagedView(page_count, build_page, owner_id=interaction.user.id)
+                    message = await interaction.followup.send(embed=view.current_embed(), view=view, wait=True)
+                    # Store the message reference in the view for timeout handling
+                    view.message = message
                 else:
-                    await interaction.followup.send("No servers found.")
+                    await interaction.followup.send(embed=build_page(0))
             else:
                 await interaction.followup.send("Failed to retrieve servers.")
         except Exception as e:
@@ -2,8 +2,11 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-import re
-from utils.api_helper import server_action, get_server_logs, get_server_stats, get_server_info
+from utils.api_helper import server_action
+from utils.server_index import server_id_autocomplete
+from utils.rate_limit import rate_limited
+from utils.readiness import log_shows_ready
+from utils.planner import RequestPlan
 
 class StartCommand(commands.Cog):
     def __init__(self, bot):
@@ -12,17 +15,13 @@ class StartCommand(commands.Cog):
     @app_commands.command(
         name="start", description="Start a server by providing its server ID."
     )
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("start")
     async def start(self, interaction: discord.Interaction, server_id: str):
         try:
-            # Check if server exists and get its name
-            server_name = f"Server {server_id}"
-            try:
-                server_info = get_server_info(server_id)
-                if server_info.get("status") == "ok":
-                    server_data = server_info.get("data", {})
-                    server_name = server_data.get("server_name", f"Server {server_id}")
-            except Exception as e:
-                print(f"Error getting server info: {e}")
+            # Get the server's name and whether it already runs, both at once
+            plan = await RequestPlan(server_id).info().stats().run()
+            server_name = plan.data("info").server_name if plan.ok("info") else f"Server {server_id}"
             
             # Initial response with loading animation
             loading_embed = discord.Embed(
@@ -34,16 +33,7 @@ class StartCommand(commands.Cog):
             await interaction.response.send_message(embed=loading_embed)
 
             # Check if server is already running
-            already_running = False
-            try:
-                stats_data = get_server_stats(server_id)
-                if stats_data.get("status") == "ok":
-                    stats = stats_data.get("data", {})
-                    already_running = stats.get("running", False)
-            except Exception as e:
-                print(f"Error checking server status: {e}")
-
-            if already_running:
+            if plan.ok("stats") and plan.data("stats").running:
                 already_running_embed = discord.Embed(
                     title="ℹ️ Server Already Running",
                     description=f"{server_name} is already online.",
@@ -53,7 +43,7 @@ class StartCommand(commands.Cog):
                 return
                 
             # Start the server
-            data = server_action(server_id, "start_server")
+            data = await asyncio.to_thread(server_action, server_id, "start_server")
 
             if data.get("status") != "ok":
                 # If there's an error, update the message immediately
@@ -68,32 +58,27 @@ class StartCommand(commands.Cog):
             # Wait a bit for server to begin startup process
             await asyncio.sleep(2)
 
-            # Pattern to look for in logs to determine if server is fully started
-            done_pattern = re.compile(r"\[.*?\] \[.*?INFO\].*?Done \(.*?\)! For help, type \"help\"")
             server_fully_started = False
             
             # Update the message every 5 seconds until server is fully started or max retries reached
             max_updates = 12  # 60 seconds maximum wait time
             for i in range(max_updates):
                 try:
-                    # Get server logs
-                    logs_data = get_server_logs(server_id)
+                    # Get server logs and status together
+                    update = await RequestPlan(server_id).stats().logs().run()
+                    logs_data = update.response("logs")
+                    stats_data = update.response("stats")
 
                     # Check server status to determine embed color and state
                     is_running = False
                     embed_color = discord.Color.gold()  # Default yellow for starting
                     
-                    try:
-                        stats_data = get_server_stats(server_id)
-                        if stats_data.get("status") == "ok":
-                            stats = stats_data.get("data", {})
-                            is_running = stats.get("running", False)
-                            if is_running:
-                                embed_color = discord.Color.green()  # Green if running
-                            else:
-                                embed_color = discord.Color.gold()   # Yellow if still starting
-                    except Exception as e:
-                        print(f"Error checking server status: {e}")
+                    if stats_data.get("status") == "ok":
+                        is_running = stats_data["data"].running
+                        if is_running:
+                            embed_color = discord.Color.green()  # Green if running
+                        else:
+                            embed_color = discord.Color.gold()   # Yellow if still starting
                     
                     # Create updated embed
                     status_text = "🔄 Starting..." if not server_fully_started else "✅ Started"
@@ -106,17 +91,15 @@ class StartCommand(commands.Cog):
                     # Add logs if available and scan for "Done" message
                     log_text = ""
                     if logs_data.get("status") == "ok":
-                        log_lines = logs_data.get("data", [])
+                        log_lines = logs_data["data"].lines
                         if log_lines:
                             # Scan logs for the "Done" message
-                            for line in log_lines:
-                                if done_pattern.search(line):
-                                    server_fully_started = True
-                                    log_embed.color = discord.Color.green()
-                                    status_text = "✅ Started and Ready!"
-                                    log_embed.title = f"🚀 {server_name} - {status_text}"
-                                    log_embed.description = f"The server has fully started and is ready to use!"
-                                    break
+                            if log_shows_ready(log_lines):
+                                server_fully_started = True
+                                log_embed.color = discord.Color.green()
+                                status_text = "✅ Started and Ready!"
+                                log_embed.title = f"🚀 {server_name} - {status_text}"
+                                log_embed.description = f"The server has fully started and is ready to use!"
                                     
                             # Show the last 10 lines of logs
                             log_text = "\n".join(log_lines[-10:])
@@ -164,8 +147,8 @@ class StartCommand(commands.Cog):
 
                     # Add info about players if server is running
                     if is_running and stats_data.get("status") == "ok":
-                        stats = stats_data.get("data", {})
-                        player_count = f"{stats.get('online', 0)}/{stats.get('max', 0)}"
+                        stats = stats_data["data"]
+                        player_count = f"{stats.online}/{stats.max}"
                         log_embed.add_field(
                             name="Players",
                             value=player_count,
@@ -2,24 +2,24 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from utils.api_helper import server_action, get_server_stats, get_server_info, get_server_logs
+from utils.api_helper import server_action
+from utils.server_index import server_id_autocomplete
+from utils.rate_limit import rate_limited
+from utils.alerts import alert_manager
+from utils.planner import RequestPlan
 
 class StopCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     @app_commands.command(name="stop", description="Stop a server by providing its server ID.")
+    @app_commands.autocomplete(server_id=server_id_autocomplete)
+    @rate_limited("stop")
     async def stop(self, interaction: discord.Interaction, server_id: str):
         try:
             # Check if server exists and get its name
-            server_name = f"Server {server_id}"
-            try:
-                server_info = get_server_info(server_id)
-                if server_info.get("status") == "ok":
-                    server_data = server_info.get("data", {})
-                    server_name = server_data.get("server_name", f"Server {server_id}")
-            except Exception as e:
-                print(f"Error getting server info: {e}")
+            plan = await RequestPlan(server_id).info().run()
+            server_name = plan.data("info").server_name if plan.ok("info") else f"Server {server_id}"
             
             # Initial response with loading animation
             loading_embed = discord.Embed(
@@ -30,8 +30,9 @@ class StopCommand(commands.Cog):
             
             await interaction.response.send_message(embed=loading_embed)
 
-            # Send stop command to server
-            data = server_action(server_id, "stop_server")
+            # Send stop command to server, and tell the alerting that this stop is intended
+            alert_manager.expect_stop(server_id)
+            data = await asyncio.to_thread(server_action, server_id, "stop_server")
 
             if data.get("status") != "ok":
                 # If there's an error, update the message immediately
@@ -47,14 +48,8 @@ class StopCommand(commands.Cog):
             await asyncio.sleep(2)
 
             # Check if the server was running before we attempt updates
-            server_was_running = False
-            try:
-                stats_data = get_server_stats(server_id)
-                if stats_data.get("status") == "ok":
-                    stats = stats_data.get("data", {})
-                    server_was_running = stats.get("running", False)
-            except Exception as e:
-                print(f"Error checking initial server status: {e}")
+            plan = await RequestPlan(server_id).stats().run()
+            server_was_running = plan.ok("stats") and plan.data("stats").running
                 
             # If server wasn't running, show an appropriate message and exit
             if not server_was_running:
@@ -70,30 +65,18 @@ class StopCommand(commands.Cog):
             max_updates = 8
             for i in range(max_updates):
                 try:
-                    # Get server status
-                    is_running = False
-                    try:
-                        stats_data = get_server_stats(server_id)
-                        if stats_data.get("status") == "ok":
-                            stats = stats_data.get("data", {})
-                            is_running = stats.get("running", False)
-                    except Exception as e:
-                        print(f"Error checking server status: {e}")
+                    # Get server status, and the logs only while the server is still running
+                    update = await RequestPlan(server_id).stats().logs(only_if_running=True).run()
+                    is_running = update.ok("stats") and update.data("stats").running
                         
-                    # Try to get logs if the server is still running
                     log_text = ""
-                    if is_running:
-                        try:
-                            logs_data = get_server_logs(server_id)
-                            if logs_data.get("status") == "ok":
-                                log_lines = logs_data.get("data", [])
-                                if log_lines:
-                                    # Show the last 5 lines
-                                    log_text = "\n".join(log_lines[-5:])
-                                    if len(log_text) > 1000:
-                                        log_text = "...(truncated)...\n" + log_text[-1000:]
-                        except Exception as e:
-                            print(f"Error getting logs: {e}")
+                    if update.ok("logs"):
+                        log_lines = update.data("logs").lines
+                        if log_lines:
+                            # Show the last 5 lines
+                            log_text = "\n".join(log_lines[-5:])
+                            if len(log_text) > 1000:
+                                log_text = "...(truncated)...\n" + log_text[-1000:]
                     
                     # Create updated embed
                     status_color = discord.Color.gold() if is_running else discord.Color.green()
@@ -0,0 +1,114 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+from utils.api_helper import server_action, get_server_stats, load_config
+from utils.server_groups import resolve_targets, targets_autocomplete
+from utils.progress import ProgressBoard
+from utils.rate_limit import rate_limited
+from utils.alerts import alert_manager
+
+class StopAllCommand(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        stopall_config = load_config().get("stopall", {})
+        self.max_concurrent = stopall_config.get("max_concurrent", 8)
+        self.poll_interval = stopall_config.get("poll_interval_seconds", 5)
+        self.kill_after = stopall_config.get("kill_after_seconds", 120)
+        self.kill_grace = stopall_config.get("kill_grace_seconds", 30)
+
+    async def poll_running(self, server_ids, limit):
+        """One stats pass over `server_ids`; returns {server_id: running or None if unknown}"""
+        async def poll_one(server_id):
+            async with limit:
+                stats_data = await asyncio.to_thread(get_server_stats, server_id)
+            if stats_data.get("status") != "ok":
+                return server_id, None
+            return server_id, stats_data["data"].running
+
+        return dict(await asyncio.gather(*(poll_one(server_id) for server_id in server_ids)))
+
+    async def send_action(self, board, server_id, action, limit):
+        """Send stop_server or kill_server; returns False and marks the server failed on error"""
+        alert_manager.expect_stop(server_id)
+        async with limit:
+            data = await asyncio.to_thread(server_action, server_id, action)
+        if data.get("status") != "ok":
+            board.set(server_id, f"❌ {action} failed: {data.get('message', 'Unknown error')}"[:100])
+            return False
+        return True
+
+    @app_commands.command(name="stopall", description="Gracefully stop many servers at once, e.g. before host maintenance (admins only).")
+    @app_commands.describe(
+        target="A server group from config.json, a comma-separated list of server IDs, or * for all servers (default)",
+        kill_after="Seconds to wait for a graceful stop before killing the server",
+    )
+    @app_commands.autocomplete(target=targets_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.checks.has_permissions(administrator=True)
+    @rate_limited("stopall")
+    async def stopall(self, interaction: discord.Interaction, target: str = "*",
+                      kill_after: app_commands.Range[int, 10, 3600] = None):
+        targets = resolve_targets(target)
+        if not targets:
+            await interaction.response.send_message(f"No servers found for `{target}`.", ephemeral=True)
+            return
+
+        await interaction.response.defer(thinking=True)
+        board = ProgressBoard(interaction, f"🛑 Stopping Servers: {target}"[:256], targets, initial_state="🔍 Checking")
+        await board.start()
+
+        limit = asyncio.Semaphore(self.max_concurrent)
+        loop = asyncio.get_running_loop()
+        kill_after = kill_after or self.kill_after
+
+        # Stop everything that is running, all at once under the parallelism cap
+        stopping = []
+        for server_id, running in (await self.poll_running(targets, limit)).items():
+            if running is None:
+                board.set(server_id, "❓ Status unavailable")
+            elif running:
+                stopping.append(server_id)
+                board.set(server_id, "🛑 Stopping")
+            else:
+                board.set(server_id, "⚪ Already offline")
+        results = await asyncio.gather(*(self.send_action(board, server_id, "stop_server", limit) for server_id in stopping))
+        pending = {server_id for server_id, ok in zip(stopping, results) if ok}
+        board.note(f"Sent stop to {len(pending)} server(s)")
+
+        # One shared stats pass per tick tracks every server that is still going down
+        started = loop.time()
+        killed = set()
+        escalated = False
+        while pending:
+            await asyncio.sleep(self.poll_interval)
+            for server_id, running in (await self.poll_running(pending, limit)).items():
+                if running is False:
+                    pending.discard(server_id)
+                    board.set(server_id, "💀 Killed" if server_id in killed else "✅ Stopped")
+
+            elapsed = loop.time() - started
+            if pending and not escalated and elapsed >= kill_after:
+                # Escalate the stragglers, a hung shutdown should not block maintenance
+                escalated = True
+                board.note(f"⚠️ {len(pending)} server(s) still running after {kill_after}s, killing them")
+                stragglers = sorted(pending)
+                for server_id in stragglers:
+                    board.set(server_id, "🔪 Killing")
+                results = await asyncio.gather(*(self.send_action(board, server_id, "kill_server", limit) for server_id in stragglers))
+                killed = {server_id for server_id, ok in zip(stragglers, results) if ok}
+                pending = set(killed)
+            elif pending and elapsed >= kill_after + self.kill_grace:
+                for server_id in pending:
+                    board.set(server_id, "❌ Still running")
+                board.note(f"❌ {len(pending)} server(s) did not stop")
+                break
+
+        failed = sum(1 for state in board.states.values() if state.startswith(("❌", "❓")))
+        if failed:
+            await board.finish("⚠️ Some Servers Did Not Stop", discord.Color.gold(), f"{failed} of {len(targets)} server(s) need attention")
+        else:
+            await board.finish("✅ All Servers Stopped", discord.Color.green(), f"{len(targets)} server(s) are offline")
+
+async def setup(bot):
+    await bot.add_cog(StopAllCommand(bot))
@@ -4,7 +4,16 @@ import os
 import json
 import urllib3
 import asyncio
+import argparse
+import traceback
+from discord import app_commands
 from utils.api_helper import load_config
+from utils.server_index import start_server_index
+from utils.stats_history import start_stats_collector
+from utils.persistence import rehydrate, start_snapshots, stop_snapshots
+from utils.log_watcher import start_log_watcher
+from utils.alerts import alert_manager
+from utils.rate_limit import RateLimited
 
 # Disable insecure warnings (if using self-signed certificates)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -13,25 +22,108 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 config = load_config()
 DISCORD_TOKEN = config.get("discord_token")
 
-# Set up the bot with required intents
-intents = discord.Intents.default()
-intents.message_content = True  # Enable message content intent
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Warm-start from the last snapshot so commands can answer before the first refresh
+rehydrate()
 
-# When the bot is ready, sync slash commands
-@bot.event
-async def on_ready():
+# Shard layout from config.json, overridable per process on the command line
+sharding = config.get("sharding", {})
+parser = argparse.ArgumentParser(description="Discord Crafty Bot")
+parser.add_argument("--shard-count", type=int, default=sharding.get("shard_count"),
+                    help="Total number of shards across all processes")
+parser.add_argument("--shard-ids", default=sharding.get("shard_ids"),
+                    help="Comma-separated shard IDs this process runs, e.g. 0,1")
+args = parser.parse_args()
+
+shard_ids = args.shard_ids
+if isinstance(shard_ids, str):
+    shard_ids = [int(shard_id) for shard_id in shard_ids.split(",") if shard_id.strip()]
+sharded = sharding.get("enabled", False) or args.shard_count is not None or shard_ids is not None
+
+# Alerts, snapshots and the command sync run once, in the process that owns shard 0
+primary = not shard_ids or 0 in shard_ids
+
+# Lean mode: slash commands need no message content, members or message cache
+lean = sharding.get("lean", True)
+if lean:
+    intents = discord.Intents.none()
+    intents.guilds = True
+    bot_options = {
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+    }
+else:
+    intents = discord.Intents.default()
+    intents.message_content = True  # Enable message content intent
+    bot_options = {}
+
+if sharded:
+    if shard_ids is not None and args.shard_count is None:
+        parser.error("--shard-ids needs --shard-count (or sharding.shard_count in config.json)")
+    bot = commands.AutoShardedBot(command_prefix="!", intents=intents, shard_count=args.shard_count,
+                                  shard_ids=shard_ids, **bot_options)
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents, **bot_options)
+
+# Runs once after login, before connecting to the gateway (on_ready fires again on every reconnect)
+async def setup_hook():
     try:
         # Load all command modules, but skip __init__.py files
         for filename in os.listdir('./commands'):
             if filename.endswith('.py') and filename != '__init__.py':
                 await bot.load_extension(f'commands.{filename[:-3]}')
         
+        # Every process keeps its own read-side state, since /history, /graph,
+        # /players and autocomplete answer from memory
+
+        # Keep the autocomplete index of server names and IDs warm in the background
+        start_server_index()
+        
+        # Sample stats of every server for /history
+        start_stats_collector()
+        
+        # Follow the logs of running servers for player sessions and lag alerts
+        start_log_watcher()
+
+        if not primary:
+            return
+
+        # Alerts are only sent from one process; elsewhere the manager stays detached
+        alert_manager.attach(bot)
+        
+        # Periodically checkpoint the fleet state to SQLite for the next restart
+        start_snapshots()
+        
         synced = await bot.tree.sync()
         print(f"Synced {len(synced)} commands!")
     except Exception as e:
         print(f"Error syncing commands: {e}")
-    print(f"Logged in as {bot.user} (ID: {bot.user.id})")
+
+bot.setup_hook = setup_hook
+
+@bot.event
+async def on_ready():
+    shards = f" with shards {sorted(bot.shards)}" if sharded else ""
+    print(f"Logged in as {bot.user} (ID: {bot.user.id}){shards}")
+
+# Friendly replies for rate-limited and admin-only commands, default logging for everything else
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    if isinstance(error, (RateLimited, app_commands.MissingPermissions)):
+        message = str(error)
+        if isinstance(error, app_commands.MissingPermissions):
+            message = "❌ You need administrator permissions to use this command."
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+        return
+    print(f"Error in command {interaction.command.name if interaction.command else 'unknown'}: {error}")
+    traceback.print_exception(type(error), error, error.__traceback__)
 
 # Run the bot
 bot.run(DISCORD_TOKEN)
+
+# Save the latest state once more so the next start is warm
+if primary:
+    stop_snapshots()
@@ -0,0 +1,12 @@
+import time
+import utils.api_helper as api_helper
+from utils.alerts import AlertManager
+
+def test_expected_stops_use_the_canonical_server_id(monkeypatch):
+    panels = {"eu": api_helper.Panel("eu", "https://eu/api/v2", "token"), "us": api_helper.Panel("us", "https://us/api/v2", "token")}
+    monkeypatch.setattr(api_helper, "_panels", panels)
+    alerts = AlertManager({})
+    alerts.expect_stop(" 3 ")
+    alerts.expect_stop("us:4")
+    assert set(alerts.expected_stops) == {"eu:3", "us:4"}
+    assert alerts._stop_expected("eu:3", time.time())
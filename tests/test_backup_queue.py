@@ -0,0 +1,50 @@
+import asyncio
+import utils.backup_queue as backup_module
+from utils.backup_queue import BackupQueue, archive_names
+
+def fake_panel(monkeypatch, listings):
+    """Serve backup listings in turn per server; the last one repeats"""
+    calls = {}
+
+    def get_backup_info(server_id):
+        count = calls[server_id] = calls.get(server_id, 0) + 1
+        served = listings[server_id]
+        return {"status": "ok", "data": served[min(count, len(served)) - 1]}
+
+    monkeypatch.setattr(backup_module, "get_backup_info", get_backup_info)
+    monkeypatch.setattr(backup_module, "server_action", lambda server_id, action: {"status": "ok"})
+    monkeypatch.setattr(backup_module, "get_server_stats", lambda server_id: {"status": "error"})
+    monkeypatch.setattr(backup_module, "resolve_server_id", lambda server_id: (type("Panel", (), {"name": "main"}), server_id))
+
+def test_archive_names_walks_the_listing():
+    data = {"backup_path": "/backups", "backup_list": [{"path": "2024-03-02_18-21-43.zip", "size": 10}, "notes.txt"]}
+    assert archive_names(data) == {"2024-03-02_18-21-43.zip"}
+
+def test_slot_is_held_until_a_new_archive_appears(monkeypatch):
+    old = ["old.zip"]
+    fake_panel(monkeypatch, {"1": [old, old, old, old + ["new.zip"]], "2": [old, old + ["other.zip"]]})
+    queue = BackupQueue(poll_interval=0.01, min_hold=0)
+
+    async def run():
+        first, _ = queue.submit("1", world_size="185MB")
+        second, _ = queue.submit("2")
+        await first.done.wait()
+        # Only one backup per host, so the second job waited for the first archive
+        assert second.state == "queued"
+        await second.done.wait()
+        return first
+
+    first = asyncio.run(run())
+    assert first.state == "done"
+
+def test_without_archives_to_compare_the_conservative_hold_applies(monkeypatch):
+    fake_panel(monkeypatch, {"1": [{}]})
+    queue = BackupQueue(poll_interval=0.01, min_hold=0.2)
+
+    async def run():
+        job, _ = queue.submit("1", world_size="1MB")
+        await job.done.wait()
+        return job
+
+    job = asyncio.run(run())
+    assert job.finished_at - job.started_at >= 0.2
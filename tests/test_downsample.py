@@ -0,0 +1,22 @@
+from utils.downsample import lttb
+
+def test_short_series_are_returned_unchanged():
+    xs, ys = list(range(10)), [float(i) for i in range(10)]
+    assert lttb(xs, ys, 20) == (xs, ys)
+    assert lttb(xs, ys, 2) == (xs, ys)
+
+def test_keeps_endpoints_and_threshold():
+    xs = list(range(1000))
+    ys = [float(i % 7) for i in xs]
+    sampled_xs, sampled_ys = lttb(xs, ys, 50)
+    assert len(sampled_xs) == len(sampled_ys) == 50
+    assert sampled_xs[0] == 0 and sampled_xs[-1] == 999
+    assert sampled_xs == sorted(sampled_xs)
+
+def test_keeps_a_single_spike():
+    xs = list(range(1000))
+    ys = [0.0] * 1000
+    ys[517] = 100.0
+    sampled_xs, sampled_ys = lttb(xs, ys, 20)
+    assert 100.0 in sampled_ys
+    assert sampled_xs[sampled_ys.index(100.0)] == 517
@@ -0,0 +1,29 @@
+import gzip
+import random
+from utils.log_export import FLUSH_MARGIN, compress_log_lines, _compress_from
+
+def random_lines(count, seed=1):
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(200)) for _ in range(count)]
+
+def test_result_always_ends_at_the_newest_line():
+    # The old lines compress far better than the newest ones, so the ratio
+    # estimate is too optimistic on every retry
+    lines = [f"[10:00:00] [Server thread/INFO]: tick {number % 10}" for number in range(200_000)]
+    lines += random_lines(1500)
+    data, start, count = compress_log_lines(lines, 300 * 1024)
+    assert len(data) <= 300 * 1024
+    assert start + count == len(lines)
+    assert gzip.decompress(data).decode().splitlines() == lines[start:]
+
+def test_everything_fits_under_a_large_cap():
+    lines = random_lines(100)
+    data, start, count = compress_log_lines(lines)
+    assert (start, count) == (0, 100)
+    assert gzip.decompress(data).decode().splitlines() == lines
+
+def test_stream_stays_valid_gzip_when_a_chunk_does_not_fit():
+    lines = random_lines(5000)
+    data, end, _ = _compress_from(lines, 0, FLUSH_MARGIN + 100 * 1024)
+    assert 0 < end < len(lines)
+    assert gzip.decompress(data).decode().splitlines() == lines[:end]
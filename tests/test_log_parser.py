@@ -0,0 +1,107 @@
+from utils.log_parser import LogCache, ParsedLog, appended_lines, parse_line
+
+def test_parse_line_formats():
+    record = parse_line(0, "[18:27:55] [Server thread/INFO]: Done (3.2s)!")
+    assert (record.time, record.thread, record.level, record.message) == (18 * 3600 + 27 * 60 + 55, "Server thread", "INFO", "Done (3.2s)!")
+
+    # Paper console format without a thread, and a level alias
+    record = parse_line(0, "[08:00:01 WARNING]: Can't keep up!")
+    assert (record.thread, record.level, record.message) == ("", "WARN", "Can't keep up!")
+
+    assert parse_line(0, "Starting minecraft server version 1.20.4") is None
+
+def test_midnight_rollover_moves_to_the_next_day():
+    parsed = ParsedLog([
+        "[23:59:50] [Server thread/INFO]: before midnight",
+        "[00:00:05] [Server thread/INFO]: after midnight",
+    ])
+    assert [record.time for record in parsed.records] == [86390, 86405]
+    assert parsed.day_offset == 86400
+    assert list(parsed.times) == [86390, 86405]
+
+def test_small_backward_steps_are_not_a_rollover():
+    parsed = ParsedLog([
+        "[12:00:10] [Worker-1/INFO]: a",
+        "[12:00:05] [Worker-2/INFO]: logged out of order",
+        "[12:00:20] [Worker-1/INFO]: b",
+    ])
+    assert parsed.day_offset == 0
+    assert parsed.records[1].time == 12 * 3600 + 5
+    # The time index is clamped so it stays sorted for binary search
+    assert list(parsed.times) == sorted(parsed.times)
+
+def test_rollover_across_extend_calls():
+    parsed = ParsedLog(["[23:30:00] [Server thread/INFO]: late"])
+    parsed.extend(["[00:10:00] [Server thread/INFO]: early"])
+    assert parsed.records[-1].time == 86400 + 600
+    assert [record.message for record in parsed.between(86400, None)] == ["early"]
+
+def test_stack_trace_lines_attach_to_the_previous_record():
+    parsed = ParsedLog([
+        "[10:00:00] [Server thread/ERROR]: Encountered an unexpected exception",
+        "java.lang.NullPointerException: boom",
+        "\tat net.minecraft.server.MinecraftServer.tick(MinecraftServer.java:871)",
+        "Caused by: java.lang.IllegalStateException",
+        "\t... 3 more",
+        "[10:00:01] [Server thread/INFO]: next",
+    ])
+    assert len(parsed.records) == 2
+    error = parsed.records[0]
+    assert error.line_count == 5
+    assert error.text().splitlines()[1] == "java.lang.NullPointerException: boom"
+    assert parsed.records[1].line == 5
+    assert [record.message for record in parsed.by_level("ERROR")] == ["Encountered an unexpected exception"]
+
+def test_continuation_across_extend_calls_creates_no_new_record():
+    cache = LogCache()
+    lines = ["[10:00:00] [Server thread/ERROR]: failed"]
+    cache.update_records("1", lines)
+    lines = lines + ["\tat some.Class.method(Class.java:1)"]
+    parsed, new_lines, new_records, rotated = cache.update_records("1", lines)
+    assert new_lines == ["\tat some.Class.method(Class.java:1)"]
+    assert new_records == [] and not rotated
+    assert parsed.records[0].extra == ("\tat some.Class.method(Class.java:1)",)
+
+def test_plain_lines_without_a_record_before_them_stay_records():
+    parsed = ParsedLog(["\tindented banner", "[10:00:00] [main/INFO]: Loading"])
+    assert [record.time for record in parsed.records][0] == -1
+    assert len(parsed.records) == 2
+
+def test_indexes_only_point_at_appended_records():
+    parsed = ParsedLog()
+    for second in range(50):
+        parsed.extend([f"[10:00:{second:02d}] [Server thread/INFO]: tick"])
+        assert len(parsed.time_positions) == len(parsed.times)
+        assert parsed.time_positions[-1] < len(parsed.records)
+        assert max(parsed.level_index["INFO"]) < len(parsed.records)
+
+def test_log_cache_detects_rotation():
+    cache = LogCache()
+    cache.update_records("1", ["[10:00:00] [main/INFO]: old"])
+    parsed, _, new_records, rotated = cache.update_records("1", ["[11:00:00] [main/INFO]: new"])
+    assert rotated
+    assert [record.message for record in new_records] == ["new"]
+
+def test_appended_lines_diffs_by_overlap():
+    # The buffer dropped its oldest line and gained two new ones
+    assert appended_lines(["a", "b", "c"], ["b", "c", "d", "e"]) == (["d", "e"], True)
+    assert appended_lines(["a", "b"], ["a", "b"]) == ([], True)
+    assert appended_lines([], ["a"]) == (["a"], False)
+    assert appended_lines(["a", "b"], ["x", "y"]) == (["x", "y"], False)
+
+def test_log_cache_evicts_the_least_recently_used_log_over_the_cap():
+    cache = LogCache(max_lines=5)
+    cache.update("1", ["a", "b"])
+    cache.update("2", ["c", "d"])
+    cache.get("1")
+    cache.update("1", ["a", "b", "e"])
+    cache.update("3", ["f", "g"])
+    assert cache.get("2") is None
+    assert cache.get("1") is not None and cache.get("3") is not None
+
+def test_log_cache_retain_forgets_other_servers():
+    cache = LogCache()
+    cache.update("1", ["a"])
+    cache.update("2", ["b"])
+    cache.retain(["2"])
+    assert list(cache.logs) == ["2"]
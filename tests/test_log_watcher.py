@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+from utils.log_watcher import LogWatcher
+
+def test_only_lines_added_to_the_stdout_buffer_are_new():
+    watcher = LogWatcher()
+    first = ["[10:00:00] [Server thread/INFO]: a", "[10:00:01] [Server thread/INFO]: b"]
+    _, records, rotated = watcher._advance("1", first)
+    assert [record.message for record in records] == ["a", "b"] and not rotated
+
+    # The buffer dropped its oldest line and gained a new one
+    _, records, rotated = watcher._advance("1", first[1:] + ["[10:00:02] [Server thread/INFO]: c"])
+    assert [record.message for record in records] == ["c"] and not rotated
+
+def test_a_buffer_that_started_over_counts_as_rotated():
+    watcher = LogWatcher()
+    watcher._advance("1", [f"[10:00:0{second}] [Server thread/INFO]: old" for second in range(5)])
+    _, records, rotated = watcher._advance("1", ["[11:00:00] [main/INFO]: Starting"])
+    assert rotated
+    assert [record.message for record in records] == ["Starting"]
+
+def test_stopped_or_removed_servers_are_forgotten():
+    watcher = LogWatcher()
+    watcher._advance("1", ["a"])
+    watcher._advance("2", ["b"])
+    running, stopped = SimpleNamespace(running=True), SimpleNamespace(running=False)
+    watcher.on_stats("1", (0, running), stopped, 10)
+    assert list(watcher.cursors) == ["2"]
+    watcher.on_servers([SimpleNamespace(server_id="3")])
+    assert watcher.cursors == {}
@@ -0,0 +1,19 @@
+from commands.logsearch_cmd import format_matches
+from utils.log_search import SearchResult
+
+def make_result(matches):
+    return SearchResult(matches, 10, 10, False, False)
+
+def test_an_oversized_first_match_is_truncated_instead_of_dropped():
+    context = [(4, "before " * 400), (5, "error " + "x" * 5000), (6, "after")]
+    text, shown = format_matches(make_result([(5, context), (9, [(9, "second")])]))
+    assert 0 < len(text) <= 3900
+    assert shown == 2 and text.endswith("second")
+    assert ">     5 | error" in text
+    assert "after" in text
+
+def test_matches_are_cut_at_the_limit():
+    matches = [(number, [(number, "y" * 100)]) for number in range(100)]
+    text, shown = format_matches(make_result(matches), limit=500)
+    assert shown == 4
+    assert len(text) <= 500
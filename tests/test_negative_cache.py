@@ -0,0 +1,22 @@
+from utils.negative_cache import NegativeCache
+
+CRAFTY_ERROR = b'{"status": "error", "error": "INTERNAL_ERROR", "error_data": "server not loaded"}'
+
+def test_crafty_errors_are_remembered():
+    cache = NegativeCache()
+    assert cache.remember("1", 500, CRAFTY_ERROR)["error"] == "UNAVAILABLE"
+    assert cache.get("1")["error"] == "UNAVAILABLE"
+    assert cache.remember("2", 404)["error"] == "NOT_FOUND"
+
+def test_gateway_errors_are_not_remembered():
+    cache = NegativeCache()
+    for status_code in (502, 503, 504):
+        assert cache.remember("1", status_code, b"<html><body>502 Bad Gateway</body></html>") is None
+    assert cache.remember("1", 503, b"") is None
+    assert cache.remember("1", 500, b'{"status": "ok", "data": {}}') is None
+    assert cache.get("1") is None
+
+def test_entries_expire():
+    cache = NegativeCache(ttl=0)
+    cache.remember("1", 404)
+    assert cache.get("1") is None
@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+from utils.log_parser import ParsedLog
+from utils.player_sessions import PlayerSessionIndex
+
+def test_sessions_close_when_the_server_stops_without_a_stopping_line():
+    index = PlayerSessionIndex()
+    parsed = ParsedLog(["[10:00:00] [Server thread/INFO]: Steve joined the game"])
+    index.on_log_records("1", parsed, parsed.records, False)
+    assert list(index.get("1").online) == ["Steve"]
+
+    running, stopped = SimpleNamespace(running=True), SimpleNamespace(running=False)
+    index.on_stats("1", (990.0, running), running, 1000.0)
+    assert list(index.get("1").online) == ["Steve"]
+    index.on_stats("1", (1000.0, running), stopped, 1010.0)
+    assert index.get("1").online == {}
+    session = index.get("1").recent_sessions[-1]
+    assert (session.name, session.left, session.reason) == ("Steve", 1010.0, "server stopped")
@@ -0,0 +1,54 @@
+import math
+from utils.rate_limit import RateLimiter, TokenBucket
+
+LIMITS = {
+    "user": {"capacity": 10, "refill_per_second": 1.0},
+    "guild": {"capacity": 40, "refill_per_second": 1.0},
+    "server": {"capacity": 15, "refill_per_second": 0.25},
+}
+
+def test_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(10, 1.0, now=0)
+    bucket.tokens = 0
+    bucket.refill(4)
+    assert bucket.tokens == 4
+    bucket.refill(100)
+    assert bucket.tokens == 10
+
+def test_retry_after_and_oversized_costs():
+    bucket = TokenBucket(10, 2.0, now=0)
+    bucket.tokens = 1
+    assert bucket.retry_after(1) == 0
+    assert bucket.retry_after(5) == 2.0
+    assert math.isinf(bucket.retry_after(11))
+
+def test_rejected_calls_take_no_tokens():
+    limiter = RateLimiter(LIMITS, {"logs": 2})
+    # The server bucket can pay, the user bucket cannot
+    assert limiter.acquire(8, user_id=1, guild_id=1, now=0) == 0
+    assert limiter.acquire(8, user_id=1, guild_id=1, server_id="3", now=0) > 0
+    assert limiter.buckets[("server", "3")].tokens == 15
+
+def test_buckets_are_separate_per_user():
+    limiter = RateLimiter(LIMITS, {})
+    assert limiter.acquire(10, user_id=1, now=0) == 0
+    assert limiter.acquire(1, user_id=1, now=0) > 0
+    assert limiter.acquire(10, user_id=2, now=0) == 0
+
+def test_largest_logs_and_console_requests_fit_the_default_bucket():
+    from types import SimpleNamespace
+    from commands.console_cmd import console_extra_cost
+    from commands.logs_cmd import logs_extra_cost
+    limiter = RateLimiter()
+    assert limiter.acquire(limiter.cost_of("logs", logs_extra_cost(SimpleNamespace(lines=100000))), user_id=1, now=0) == 0
+    assert limiter.acquire(limiter.cost_of("console", console_extra_cost(SimpleNamespace(server_id="*"))), user_id=2, now=0) == 0
+
+def test_negative_or_zero_extra_cost_still_costs_a_token():
+    from types import SimpleNamespace
+    from commands.logs_cmd import logs_extra_cost
+    limiter = RateLimiter(LIMITS, {"logs": 2, "free": 0})
+    assert logs_extra_cost(SimpleNamespace(lines=-1000)) == 0
+    assert limiter.cost_of("logs", -8) == 1
+    assert limiter.cost_of("free") == 1
+    accepted = sum(limiter.acquire(limiter.cost_of("logs", -8), user_id=1, now=0) == 0 for _ in range(100))
+    assert accepted == LIMITS["user"]["capacity"]
@@ -0,0 +1,50 @@
+import threading
+import time
+from utils.scheduler import Priority, PriorityScheduler
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+def start(scheduler, priority, panel, order, release):
+    def run():
+        with scheduler.slot(priority, panel=panel, panel_limit=1):
+            order.append(priority)
+            release.wait(2)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+def test_interactive_request_overtakes_queued_background_on_a_busy_panel():
+    scheduler = PriorityScheduler(max_concurrent=8, reserved_interactive=2)
+    order = []
+    release = threading.Event()
+    scheduler.acquire(Priority.BACKGROUND, panel="main", panel_limit=1)
+    background = start(scheduler, Priority.BACKGROUND, "main", order, release)
+    wait_for(lambda: scheduler.stats()[1]["BACKGROUND"] == 1)
+    interactive = start(scheduler, Priority.INTERACTIVE, "main", order, release)
+    wait_for(lambda: scheduler.stats()[1]["INTERACTIVE"] == 1)
+
+    scheduler.release("main")
+    release.set()
+    background.join(2)
+    interactive.join(2)
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+def test_busy_panel_does_not_block_other_panels():
+    scheduler = PriorityScheduler(max_concurrent=8, reserved_interactive=2)
+    order = []
+    release = threading.Event()
+    scheduler.acquire(Priority.INTERACTIVE, panel="slow", panel_limit=1)
+    blocked = start(scheduler, Priority.INTERACTIVE, "slow", order, release)
+    wait_for(lambda: scheduler.stats()[1]["INTERACTIVE"] == 1)
+    other = start(scheduler, Priority.BACKGROUND, "fast", order, release)
+    wait_for(lambda: order == [Priority.BACKGROUND])
+
+    scheduler.release("slow")
+    release.set()
+    blocked.join(2)
+    other.join(2)
+    assert scheduler.stats() == (0, {"INTERACTIVE": 0, "WATCHER": 0, "BACKGROUND": 0})
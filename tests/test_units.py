@@ -0,0 +1,23 @@
+from utils.units import format_size, parse_duration, parse_size
+
+def test_parse_size_units():
+    assert parse_size("185.4MB") == int(185.4 * 1024 ** 2)
+    assert parse_size("1.6GB") == int(1.6 * 1024 ** 3)
+    assert parse_size("512") == 512
+    assert parse_size("2 KiB") == 2048
+    assert parse_size(1024) == 1024
+
+def test_parse_size_invalid_values():
+    assert parse_size("lots") is None
+    assert parse_size(None, 0) == 0
+    assert parse_size("", 0) == 0
+
+def test_format_size_round_trip():
+    assert format_size(None) == "Unknown"
+    assert format_size(512) == "512B"
+    assert format_size(parse_size("185.4MB")) == "185.4MB"
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("1h30m") == 5400
+    assert parse_duration("10 minutes") is None
@@ -0,0 +1,157 @@
+import asyncio
+import re
+import time
+from array import array
+import discord
+from utils.api_helper import canonical_server_id, load_config
+from utils.log_watcher import log_watcher
+from utils.server_index import server_index
+from utils.stats_history import stats_history
+
+# "Can't keep up! Is the server overloaded? Running 5033ms or 100 ticks behind"
+LAG_PATTERN = re.compile(r"Can't keep up! Is the server overloaded\? Running (\d+)ms or (\d+) ticks behind")
+
+# Number of lag events kept per server
+LAG_HISTORY_SIZE = 512
+
+class LagSeries:
+    """Ring buffers of lag events: when, how many ms behind and how many ticks skipped"""
+
+    __slots__ = ("timestamps", "ms_behind", "ticks_skipped", "head", "count")
+
+    def __init__(self, size=LAG_HISTORY_SIZE):
+        self.timestamps = array("d", bytes(8 * size))
+        self.ms_behind = array("I", bytes(4 * size))
+        self.ticks_skipped = array("I", bytes(4 * size))
+        self.head = 0
+        self.count = 0
+
+    def add(self, timestamp, ms_behind, ticks_skipped):
+        size = len(self.timestamps)
+        self.timestamps[self.head] = timestamp
+        self.ms_behind[self.head] = ms_behind
+        self.ticks_skipped[self.head] = ticks_skipped
+        self.head = (self.head + 1) % size
+        self.count = min(self.count + 1, size)
+
+    def since(self, start):
+        """(timestamp, ms_behind, ticks_skipped) of the events newer than `start`, oldest first"""
+        size = len(self.timestamps)
+        events = []
+        for offset in range(self.count):
+            position = (self.head - self.count + offset) % size
+            if self.timestamps[position] >= start:
+                events.append((self.timestamps[position], self.ms_behind[position], self.ticks_skipped[position]))
+        return events
+
+class AlertManager:
+    """Detects crashes, sustained lag and unexpected stops and posts alerts to a channel.
+
+    Detection listens to the stats collector (stats deltas) and the log
+    watcher (newly appended log lines). Each (server, kind) pair has its own
+    cooldown, so a lag storm produces one alert instead of hundreds.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.channel_id = config.get("channel_id")
+        self.cooldown = config.get("cooldown_seconds", 600)
+        self.lag_events = config.get("lag_threshold_events", 3)
+        self.lag_window = config.get("lag_window_seconds", 300)
+        self.expected_stop_window = config.get("expected_stop_seconds", 300)
+        self.max_sample_gap = config.get("max_sample_gap_seconds", 120)
+        self.bot = None
+        self.lag = {}
+        self.last_alert = {}
+        self.expected_stops = {}
+        self.tasks = set()
+
+    def attach(self, bot):
+        self.bot = bot
+
+    def expect_stop(self, server_id):
+        """Mark a stop as intentional, e.g. when it was requested through the bot"""
+        # Users may type "3" or " eu:3 "; the stats collector reports the canonical ID
+        try:
+            server_id = canonical_server_id(server_id)
+        except Exception:
+            server_id = str(server_id).strip()
+        self.expected_stops[server_id] = time.time()
+
+    def _stop_expected(self, server_id, now):
+        requested = self.expected_stops.get(server_id)
+        return requested is not None and now - requested <= self.expected_stop_window
+
+    def on_stats(self, server_id, previous, stats, timestamp):
+        """Stats listener: compare a sample with the previous one of the same server"""
+        if previous is None or timestamp - previous[0] > self.max_sample_gap:
+            # No baseline, or the baseline is from before a restart of the bot
+            return
+        before = previous[1]
+        if stats.crashed and not before.crashed:
+            self.alert(server_id, "crash", "💥 Server Crashed",
+                       "Crafty reports that the server has crashed.", discord.Color.red())
+        elif before.running and not stats.running and not stats.crashed:
+            if self._stop_expected(server_id, timestamp):
+                self.expected_stops.pop(server_id, None)
+            else:
+                self.alert(server_id, "stop", "🛑 Unexpected Stop",
+                           "The server stopped without a stop request through the bot.", discord.Color.orange())
+
+    def on_log_records(self, server_id, parsed, new_records, rotated):
+        """Log listener: record lag events and alert when lag is sustained"""
+        now = time.time()
+        found = False
+        for record in new_records:
+            match = LAG_PATTERN.search(record.message)
+            if not match:
+                continue
+            series = self.lag.get(server_id)
+            if series is None:
+                series = self.lag[server_id] = LagSeries()
+            when = parsed.to_epoch(record.time, now) if record.time >= 0 else now
+            series.add(when, int(match.group(1)), int(match.group(2)))
+            found = True
+
+        if not found:
+            return
+        events = self.lag[server_id].since(now - self.lag_window)
+        if len(events) >= self.lag_events:
+            worst = max(event[1] for event in events)
+            skipped = sum(event[2] for event in events)
+            self.alert(
+                server_id, "lag", "🐢 Sustained Lag",
+                f"The server fell behind {len(events)} times in the last {self.lag_window // 60} minutes.\n"
+                f"**Worst:** {worst}ms behind • **Ticks skipped:** {skipped}",
+                discord.Color.gold()
+            )
+
+    def alert(self, server_id, kind, title, description, color):
+        """Post an alert unless the same kind was posted for this server within the cooldown"""
+        now = time.time()
+        key = (server_id, kind)
+        if now - self.last_alert.get(key, 0) < self.cooldown:
+            return
+        self.last_alert[key] = now
+        print(f"Alert for server {server_id}: {title}")
+        if self.bot is None or not self.channel_id:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(server_id, title, description, color))
+        # Keep a reference so the task is not garbage collected before it finishes
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, server_id, title, description, color):
+        try:
+            channel = self.bot.get_channel(self.channel_id) or await self.bot.fetch_channel(self.channel_id)
+            server_name = server_index.get_name(server_id) or f"Server {server_id}"
+            embed = discord.Embed(title=f"{title}: {server_name}", description=description, color=color)
+            embed.set_footer(text=f"Server ID: {server_id} • Further {title.split(' ', 1)[1].lower()} alerts are muted for {self.cooldown // 60} minutes")
+            embed.timestamp = discord.utils.utcnow()
+            await channel.send(embed=embed)
+        except Exception as e:
+            print(f"Error sending alert: {e}")
+
+alert_manager = AlertManager(load_config().get("alerts", {}))
+stats_history.subscribe(alert_manager.on_stats)
+log_watcher.subscribe(alert_manager.on_log_records)
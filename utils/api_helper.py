@@ -1,5 +1,22 @@
+import contextvars
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
+from requests.adapters import HTTPAdapter
+from utils.scheduler import PriorityScheduler
+from utils.models import ServerInfo, ServerStats, LogResponse
+from utils.codec import decode_response
+from utils.negative_cache import NegativeCache
+
+# Separator between the panel name and the Crafty server ID, e.g. "eu:3"
+PANEL_SEPARATOR = ":"
+
+_panels = None
+_scheduler = None
+_negative_cache = None
+_panels_lock = threading.Lock()
+_action_listeners = []
 
 def load_config():
     """Load configuration from config.json"""
@@ -10,99 +27,291 @@ def load_config():
         print(f"Error loading config: {e}")
         return {}
 
+class Panel:
+    """A single Crafty Controller with its own connection pool and concurrency limit"""
+
+    def __init__(self, name, api_url, api_token, max_connections=10, max_concurrent_requests=4, verify_ssl=False, timeout=30):
+        self.name = name
+        self.api_url = api_url.rstrip("/")
+        self.headers = {
+            "Authorization": f"Bearer {api_token}",
+            "Content-Type": "application/json",
+        }
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.max_concurrent_requests = max_concurrent_requests
+
+    def request(self, method, path, priority=None, **kwargs):
+        """Send a request to this panel, waiting for a free slot first.
+
+        `priority` defaults to the class set with utils.scheduler.request_priority,
+        which is interactive unless a background loop says otherwise.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        headers = self.headers
+        if "headers" in kwargs:
+            headers = {**self.headers, **kwargs.pop("headers")}
+        # The scheduler admits requests under both the global cap and this panel's
+        # own limit, in priority order, so a slow panel holds no global slots
+        with get_scheduler().slot(priority, panel=self.name, panel_limit=self.max_concurrent_requests):
+            return self.session.request(
+                method,
+                f"{self.api_url}{path}",
+                headers=headers,
+                verify=self.verify_ssl,
+                **kwargs,
+            )
+
+def _build_panels(config):
+    """Create Panel objects from config, falling back to the single-panel keys"""
+    panel_configs = config.get("panels")
+    if not panel_configs:
+        # Single-panel setups keep using the original top-level keys
+        panel_configs = {
+            "default": {
+                "crafty_api_url": config.get("crafty_api_url", "https://localhost:8443/api/v2"),
+                "crafty_api_token": config.get("crafty_api_token"),
+            }
+        }
+
+    panels = {}
+    for name, panel_config in panel_configs.items():
+        panels[name] = Panel(
+            name,
+            panel_config.get("crafty_api_url", "https://localhost:8443/api/v2"),
+            panel_config.get("crafty_api_token"),
+            max_connections=panel_config.get("max_connections", 10),
+            max_concurrent_requests=panel_config.get("max_concurrent_requests", 4),
+            verify_ssl=panel_config.get("verify_ssl", False),
+            timeout=panel_config.get("request_timeout", 30),
+        )
+    return panels
+
+def get_panels():
+    """Get all configured panels, keyed by name. Built once and then reused."""
+    global _panels
+    if _panels is None:
+        with _panels_lock:
+            if _panels is None:
+                _panels = _build_panels(load_config())
+    return _panels
+
+def get_scheduler():
+    """Get the global request scheduler shared by all panels"""
+    global _scheduler
+    if _scheduler is None:
+        with _panels_lock:
+            if _scheduler is None:
+                scheduler_config = load_config().get("request_scheduler", {})
+                _scheduler = PriorityScheduler(
+                    max_concurrent=scheduler_config.get("max_concurrent", 8),
+                    reserved_interactive=scheduler_config.get("reserved_interactive", 2),
+                )
+    return _scheduler
+
+def get_negative_cache():
+    """Get the cache of server IDs Crafty recently could not serve"""
+    global _negative_cache
+    if _negative_cache is None:
+        with _panels_lock:
+            if _negative_cache is None:
+                _negative_cache = NegativeCache(load_config().get("negative_cache", {}).get("ttl_seconds", 15))
+    return _negative_cache
+
+def is_federated():
+    """Whether more than one panel is configured, i.e. server IDs are panel-qualified"""
+    return len(get_panels()) > 1
+
+def qualify_server_id(panel_name, server_id):
+    """Build the ID users see for a server, e.g. "eu:3" when several panels are configured"""
+    if not is_federated():
+        return str(server_id)
+    return f"{panel_name}{PANEL_SEPARATOR}{server_id}"
+
+def resolve_server_id(server_id):
+    """Split a (possibly panel-qualified) server ID into its panel and the panel-local ID"""
+    panels = get_panels()
+    server_id = str(server_id).strip()
+    panel_name, separator, local_id = server_id.partition(PANEL_SEPARATOR)
+    if separator and panel_name in panels:
+        return panels[panel_name], local_id
+    # Unqualified IDs go to the first configured panel
+    return next(iter(panels.values())), server_id
+
+def canonical_server_id(server_id):
+    """The ID the server index and the stats collector use for a server, e.g. " 3 " -> "eu:3" """
+    panel, local_id = resolve_server_id(server_id)
+    return qualify_server_id(panel.name, local_id)
+
+def _qualify_server(panel, server):
+    """Rewrite the server_id of a server dict into its panel-qualified form"""
+    if is_federated() and isinstance(server, dict) and "server_id" in server:
+        server["server_id"] = qualify_server_id(panel.name, server["server_id"])
+        server["panel"] = panel.name
+    return server
+
 def get_headers():
-    """Get common headers for API calls"""
-    config = load_config()
-    CRAFTY_API_TOKEN = config.get("crafty_api_token")
-    return {
-        "Authorization": f"Bearer {CRAFTY_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
+    """Get common headers for API calls to the default panel"""
+    return next(iter(get_panels().values())).headers
 
 def get_api_url():
-    """Get the Crafty API URL from config"""
-    config = load_config()
-    return config.get("crafty_api_url", "https://localhost:8443/api/v2")
+    """Get the Crafty API URL of the default panel"""
+    return next(iter(get_panels().values())).api_url
 
 def get_server_info(server_id):
-    """Get information about a specific server"""
+    """Get information about a specific server; "data" is a ServerInfo"""
     try:
-        response = requests.get(
-            f"{get_api_url()}/servers/{server_id}", 
-            headers=get_headers(), 
-            verify=False
-        )
-        return response.json()
+        known_failure = get_negative_cache().get(server_id)
+        if known_failure is not None:
+            return known_failure
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request("GET", f"/servers/{local_id}")
+        failure = get_negative_cache().remember(server_id, response.status_code, response.content)
+        if failure is not None:
+            return failure
+        return decode_response(response, lambda server: ServerInfo.from_payload(_qualify_server(panel, server)))
     except Exception as e:
         print(f"Error getting server info: {e}")
         return {"status": "error", "message": str(e)}
 
 def get_server_stats(server_id):
-    """Get statistics for a specific server"""
+    """Get statistics for a specific server; "data" is a ServerStats"""
     try:
-        response = requests.get(
-            f"{get_api_url()}/servers/{server_id}/stats", 
-            headers=get_headers(), 
-            verify=False
-        )
-        return response.json()
+        known_failure = get_negative_cache().get(server_id)
+        if known_failure is not None:
+            return known_failure
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request("GET", f"/servers/{local_id}/stats")
+        failure = get_negative_cache().remember(server_id, response.status_code, response.content)
+        if failure is not None:
+            return failure
+        return decode_response(response, lambda stats: ServerStats.from_payload(stats, str(server_id)))
     except Exception as e:
         print(f"Error getting server stats: {e}")
         return {"status": "error", "message": str(e)}
 
+# Only Crafty's in-memory stdout buffer of the newest lines, not the log file
+STDOUT_LOG_PARAMS = {"raw": "true"}
+
 def get_server_logs(server_id, params=None):
-    """Get logs for a specific server"""
+    """Get logs for a specific server; "data" is a LogResponse.
+
+    The whole log file is returned by default; pass STDOUT_LOG_PARAMS for just
+    the stdout buffer.
+    """
     if params is None:
         params = {"raw": "true", "file": "true"}
-    
+
     try:
-        response = requests.get(
-            f"{get_api_url()}/servers/{server_id}/logs",
-            headers=get_headers(),
-            params=params,
-            verify=False,
-        )
-        return response.json()
+        # Log errors are not remembered, a missing log file says nothing about the server
+        known_failure = get_negative_cache().get(server_id)
+        if known_failure is not None:
+            return known_failure
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request("GET", f"/servers/{local_id}/logs", params=params)
+        return decode_response(response, lambda lines: LogResponse.from_payload(lines, str(server_id)))
     except Exception as e:
         print(f"Error getting server logs: {e}")
         return {"status": "error", "message": str(e)}
 
+def subscribe_actions(listener):
+    """Call listener(server_id, action) after every server action Crafty accepted"""
+    if listener not in _action_listeners:
+        _action_listeners.append(listener)
+
 def server_action(server_id, action):
     """Perform an action on a server (start, stop, etc.)"""
     try:
-        response = requests.post(
-            f"{get_api_url()}/servers/{server_id}/action/{action}",
-            headers=get_headers(),
-            verify=False,
-        )
-        return response.json()
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request("POST", f"/servers/{local_id}/action/{action}")
+        data = decode_response(response)
+        if data.get("status") == "ok":
+            # Starting a server may load it again, so do not keep calling it unavailable
+            get_negative_cache().forget(server_id)
+            for listener in _action_listeners:
+                try:
+                    listener(str(server_id), action)
+                except Exception as e:
+                    print(f"Error in action listener {getattr(listener, '__name__', listener)}: {e}")
+        return data
     except Exception as e:
         print(f"Error performing server action: {e}")
         return {"status": "error", "message": str(e)}
 
-def get_all_servers():
-    """Get list of all available servers"""
+def send_stdin(server_id, command):
+    """Write a console command (or several, one per line) to a server's stdin"""
     try:
-        response = requests.get(
-            f"{get_api_url()}/servers", 
-            headers=get_headers(), 
-            verify=False
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request(
+            "POST",
+            f"/servers/{local_id}/stdin",
+            data=command.encode("utf-8"),
+            headers={"Content-Type": "text/plain"},
         )
-        return response.json()
+        return decode_response(response)
+    except Exception as e:
+        print(f"Error sending console command: {e}")
+        return {"status": "error", "message": str(e)}
+
+def get_panel_servers(panel):
+    """Get the list of servers of a single panel as ServerInfo objects, with panel-qualified IDs"""
+    try:
+        response = panel.request("GET", "/servers")
+        return decode_response(response, lambda servers: [ServerInfo.from_payload(_qualify_server(panel, server)) for server in servers])
     except Exception as e:
-        print(f"Error getting servers: {e}")
+        print(f"Error getting servers from panel {panel.name}: {e}")
         return {"status": "error", "message": str(e)}
 
+def iter_all_servers():
+    """Query every panel concurrently and yield (panel, response) as each one answers"""
+    panels = list(get_panels().values())
+    if len(panels) == 1:
+        yield panels[0], get_panel_servers(panels[0])
+        return
+
+    with ThreadPoolExecutor(max_workers=len(panels)) as executor:
+        # Copy the context so every panel request keeps the caller's priority class
+        futures = {
+            executor.submit(contextvars.copy_context().run, get_panel_servers, panel): panel
+            for panel in panels
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def get_all_servers():
+    """Get list of all available servers across every configured panel"""
+    servers = []
+    errors = []
+    answered = False
+    for panel, data in iter_all_servers():
+        if data.get("status") == "ok":
+            answered = True
+            servers.extend(data.get("data", []))
+        else:
+            errors.append(f"{panel.name}: {data.get('message', 'Unknown error')}")
+
+    # Only fail outright if no panel answered; a single unreachable panel
+    # should not hide the rest of the fleet
+    if not answered:
+        return {"status": "error", "message": "; ".join(errors)}
+    # Servers may have been added or loaded since their IDs were remembered as bad
+    get_negative_cache().clear()
+    result = {"status": "ok", "data": servers}
+    if errors:
+        result["errors"] = errors
+    return result
+
 def get_backup_info(server_id):
     """Get backup information for a specific server"""
     try:
-        response = requests.get(
-            f"{get_api_url()}/servers/{server_id}/backups",
-            headers=get_headers(),
-            verify=False,
-        )
+        panel, local_id = resolve_server_id(server_id)
+        response = panel.request("GET", f"/servers/{local_id}/backups")
         if response.status_code >= 200 and response.status_code < 300:
-            return response.json()
+            return decode_response(response)
         else:
             return {"status": "error", "code": response.status_code, "message": response.text}
     except Exception as e:
@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import itertools
+import time
+from utils.api_helper import server_action, get_backup_info, get_server_stats, resolve_server_id, load_config
+from utils.units import parse_size
+
+POLICIES = ("smallest_first", "largest_first", "fifo")
+
+# File names that count as finished backup archives in Crafty's backup listing
+ARCHIVE_SUFFIXES = (".zip", ".tar.gz")
+
+def archive_names(data):
+    """Every backup archive name found anywhere in a backup listing payload"""
+    if isinstance(data, str):
+        return {data} if data.endswith(ARCHIVE_SUFFIXES) else set()
+    if isinstance(data, dict):
+        data = data.values()
+    elif not isinstance(data, (list, tuple)):
+        return set()
+    names = set()
+    for value in data:
+        names |= archive_names(value)
+    return names
+
+class BackupJob:
+    """A queued or running backup of one server"""
+
+    __slots__ = ("server_id", "server_name", "host", "size", "sequence", "state", "queued_at",
+                 "started_at", "finished_at", "result", "done")
+
+    def __init__(self, server_id, server_name, host, size, sequence):
+        self.server_id = server_id
+        self.server_name = server_name
+        self.host = host
+        self.size = size
+        self.sequence = sequence
+        self.state = "queued"
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.done = asyncio.Event()
+
+class BackupQueue:
+    """Runs backups with a per-host concurrency limit, ordered by world size.
+
+    Every Crafty panel is treated as one host, since its servers share the
+    panel machine's disks. A server that is already queued or running is not
+    queued twice; the second request joins the existing job. Crafty starts a
+    backup in the background and answers right away, so a job keeps its slot
+    until the backup is over: the server's stats stop reporting a backup, or
+    a new archive shows up in the server's backup listing. Crafty's stats have
+    no backup flag, so the listing is the usual signal. When the listing had
+    no archives to compare against, a job also gives up its slot after a
+    conservative hold of at least `min_hold` seconds, longer for big worlds.
+    """
+
+    def __init__(self, max_per_host=1, policy="smallest_first", throughput=10 * 1024 ** 2,
+                 poll_interval=10, timeout=1800, min_hold=120):
+        self.max_per_host = max_per_host
+        self.policy = policy if policy in POLICIES else "smallest_first"
+        self.throughput = throughput
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.min_hold = min_hold
+        self.jobs = {}
+        self.queues = {}
+        self.running = {}
+        self.sequence = itertools.count()
+        self.tasks = set()
+
+    @classmethod
+    def from_config(cls):
+        queue_config = load_config().get("backup_queue", {})
+        return cls(
+            max_per_host=queue_config.get("max_concurrent_per_host", 1),
+            policy=queue_config.get("policy", "smallest_first"),
+            throughput=queue_config.get("assumed_throughput_mb_per_second", 10) * 1024 ** 2,
+            poll_interval=queue_config.get("poll_interval_seconds", 10),
+            timeout=queue_config.get("timeout_seconds", 1800),
+            min_hold=queue_config.get("min_hold_seconds", 120),
+        )
+
+    def _order_key(self, job):
+        # Unknown sizes go last for smallest_first and first for largest_first
+        size = job.size if job.size is not None else float("inf")
+        if self.policy == "largest_first":
+            return (-size, job.sequence)
+        if self.policy == "fifo":
+            return (job.sequence,)
+        return (size, job.sequence)
+
+    def submit(self, server_id, server_name=None, world_size=None):
+        """Queue a backup; returns (job, created). A pending job for the same server is reused."""
+        server_id = str(server_id)
+        job = self.jobs.get(server_id)
+        if job is not None and not job.done.is_set():
+            return job, False
+
+        try:
+            host = resolve_server_id(server_id)[0].name
+        except Exception:
+            host = "default"
+        job = BackupJob(server_id, server_name or f"Server {server_id}", host, parse_size(world_size), next(self.sequence))
+        self.jobs[server_id] = job
+        heapq.heappush(self.queues.setdefault(host, []), self._order_key(job) + (job.server_id,))
+        self._pump(host)
+        return job, True
+
+    def position(self, job):
+        """1-based place of a queued job among the jobs waiting for the same host, or 0"""
+        if job.state != "queued":
+            return 0
+        key = self._order_key(job) + (job.server_id,)
+        return 1 + sum(1 for entry in self.queues.get(job.host, ()) if entry < key)
+
+    def _pump(self, host):
+        queue = self.queues.get(host, [])
+        while queue and self.running.get(host, 0) < self.max_per_host:
+            job = self.jobs.get(heapq.heappop(queue)[-1])
+            if job is None or job.state != "queued":
+                continue
+            self.running[host] = self.running.get(host, 0) + 1
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            # Keep a reference so the task is not garbage collected before it finishes
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, job):
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            # Archives that exist before the backup, so the new one can be told apart
+            archives = await asyncio.to_thread(self._archives, job.server_id)
+            job.result = await asyncio.to_thread(server_action, job.server_id, "backup_server")
+            if job.result.get("status") == "ok":
+                await self._wait_for_backup(job, archives)
+        except Exception as e:
+            job.result = {"status": "error", "message": str(e)}
+        finally:
+            job.state = "done" if job.result and job.result.get("status") == "ok" else "failed"
+            job.finished_at = time.time()
+            job.done.set()
+            self.running[job.host] -= 1
+            self._pump(job.host)
+
+    @staticmethod
+    def _archives(server_id):
+        """Names of the server's backup archives, or None if the listing failed. Blocking."""
+        data = get_backup_info(server_id)
+        return archive_names(data.get("data")) if data.get("status") == "ok" else None
+
+    async def _wait_for_backup(self, job, archives):
+        """Hold the host slot until the backup is over, or for the conservative hold without a signal"""
+        loop = asyncio.get_running_loop()
+        # Only a listing that already showed archives proves that a missing new one means "not done"
+        hold = None if archives else max(self.min_hold, (job.size or 0) / self.throughput)
+        started = loop.time()
+        while loop.time() - started < self.timeout:
+            await asyncio.sleep(self.poll_interval)
+            stats_data = await asyncio.to_thread(get_server_stats, job.server_id)
+            stats = stats_data["data"] if stats_data.get("status") == "ok" else None
+            if stats is not None and stats.backing_up is not None:
+                if not stats.backing_up:
+                    return
+                continue
+            current = await asyncio.to_thread(self._archives, job.server_id)
+            if current is not None and current - (archives or set()):
+                return
+            if hold is not None and loop.time() - started >= hold:
+                return
+
+backup_queue = BackupQueue.from_config()
@@ -0,0 +1,71 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Tried in this order when "json_codec" is "auto" (the default)
+BACKENDS = ("orjson", "msgspec", "json")
+
+def _available(name):
+    return name == "json" or (name == "orjson" and orjson is not None) or (name == "msgspec" and msgspec is not None)
+
+def _make_loads(name):
+    if name == "orjson":
+        return orjson.loads
+    if name == "msgspec":
+        return msgspec.json.Decoder().decode
+    # json.loads detects UTF-8/16/32 itself when given bytes
+    return json.loads
+
+class JsonCodec:
+    """Decodes raw response bodies with the fastest JSON library that is installed.
+
+    orjson and msgspec are optional; without them the stdlib decoder is used.
+    All backends raise a ValueError subclass on invalid JSON.
+    """
+
+    def __init__(self, backend="auto"):
+        if backend not in BACKENDS or not _available(backend):
+            if backend != "auto":
+                print(f"JSON codec {backend!r} is not available, picking one automatically")
+            backend = next(name for name in BACKENDS if _available(name))
+        self.backend = backend
+        self.loads = _make_loads(backend)
+
+    def decode(self, body, build=None):
+        """Decode a Crafty response body and turn its "data" into a model with `build`.
+
+        The model is only built for successful responses whose data is an object
+        or a list, so error envelopes come back as plain dicts.
+        """
+        data = self.loads(body)
+        if not isinstance(data, dict):
+            return {"status": "error", "message": "Unexpected response from Crafty"}
+        if build is not None and data.get("status") == "ok" and isinstance(data.get("data"), (dict, list)):
+            data["data"] = build(data["data"])
+        return data
+
+def _codec_from_config():
+    # Imported here since api_helper imports this module
+    from utils.api_helper import load_config
+    return JsonCodec(load_config().get("json_codec", "auto"))
+
+_codec = None
+
+def get_codec():
+    """Get the shared codec, created from config.json on first use"""
+    global _codec
+    if _codec is None:
+        _codec = _codec_from_config()
+    return _codec
+
+def decode_response(response, build=None):
+    """Decode a requests.Response from Crafty, see JsonCodec.decode"""
+    return get_codec().decode(response.content, build)
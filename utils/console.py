@@ -0,0 +1,90 @@
+import asyncio
+from utils.api_helper import STDOUT_LOG_PARAMS, get_server_logs, send_stdin, load_config
+from utils.log_parser import appended_lines
+
+# Most captured output lines kept per server
+MAX_OUTPUT_LINES = 15
+
+class ConsoleResult:
+    """Outcome of a console command on one server"""
+
+    __slots__ = ("server_id", "ok", "error", "output")
+
+    def __init__(self, server_id, ok, error=None, output=()):
+        self.server_id = server_id
+        self.ok = ok
+        self.error = error
+        self.output = output
+
+class ConsoleBatcher:
+    """Coalesces console commands per server into a single stdin write.
+
+    The first command for a server opens a batch; commands for the same
+    server arriving within `window` seconds join it. The batch is sent as one
+    newline-separated stdin request and every caller gets that request's result.
+    """
+
+    def __init__(self, window=0.25):
+        self.window = window
+        self.pending = {}
+        self.tasks = set()
+
+    async def send(self, server_id, command):
+        server_id = str(server_id)
+        batch = self.pending.get(server_id)
+        if batch is None:
+            batch = self.pending[server_id] = ([], asyncio.get_running_loop().create_future())
+            task = asyncio.get_running_loop().create_task(self._flush_later(server_id))
+            # Keep a reference so the task is not garbage collected before it finishes
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        batch[0].append(command)
+        return await asyncio.shield(batch[1])
+
+    async def _flush_later(self, server_id):
+        await asyncio.sleep(self.window)
+        commands, future = self.pending.pop(server_id)
+        try:
+            result = await asyncio.to_thread(send_stdin, server_id, "\n".join(commands))
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        future.set_result(result)
+
+console_config = load_config().get("console", {})
+console_batcher = ConsoleBatcher(console_config.get("batch_window_seconds", 0.25))
+
+async def read_stdout(server_id):
+    """The lines currently in a server's stdout buffer"""
+    data = await asyncio.to_thread(get_server_logs, server_id, STDOUT_LOG_PARAMS)
+    if data.get("status") != "ok":
+        raise RuntimeError(data.get("message", "Could not read the console output"))
+    return data["data"].lines
+
+async def run_console_command(server_ids, command):
+    """Send `command` to every server in `server_ids` and capture what each one logs.
+
+    At most console.max_concurrent requests are in flight at once. Output is
+    what the server's stdout buffer gained between a read just before the
+    command and one after it, found by their overlap, so the log file itself
+    is never downloaded.
+    """
+    limit = asyncio.Semaphore(console_config.get("max_concurrent", 8))
+    wait = console_config.get("output_wait_seconds", 2)
+
+    async def run_one(server_id):
+        try:
+            async with limit:
+                before = await read_stdout(server_id)
+                result = await console_batcher.send(server_id, command)
+            if result.get("status") != "ok":
+                return ConsoleResult(server_id, False, result.get("message", "Unknown error"))
+            # Give the server a moment to answer, without holding a slot meanwhile
+            await asyncio.sleep(wait)
+            async with limit:
+                after = await read_stdout(server_id)
+            output, _ = appended_lines(before, after)
+            return ConsoleResult(server_id, True, output=output[-MAX_OUTPUT_LINES:])
+        except Exception as e:
+            return ConsoleResult(server_id, False, str(e))
+
+    return await asyncio.gather(*(run_one(server_id) for server_id in server_ids))
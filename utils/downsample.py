@@ -0,0 +1,44 @@
+def lttb(xs, ys, threshold):
+    """Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. Peaks and dips survive, unlike with
+    plain averaging. Returns new (xs, ys) lists with at most `threshold`
+    points.
+    """
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return list(xs), list(ys)
+
+    sampled_xs = [xs[0]]
+    sampled_ys = [ys[0]]
+    bucket_size = (length - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, length)
+        next_count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / next_count
+        avg_y = sum(ys[next_start:next_end]) / next_count
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled_xs.append(xs[best])
+        sampled_ys.append(ys[best])
+        a = best
+
+    sampled_xs.append(xs[-1])
+    sampled_ys.append(ys[-1])
+    return sampled_xs, sampled_ys
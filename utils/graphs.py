@@ -0,0 +1,38 @@
+import io
+from datetime import datetime
+from utils.downsample import lttb
+
+# Number of points actually plotted, whatever the window length
+MAX_PLOT_POINTS = 400
+
+def render_series_png(timestamps, values, title, ylabel, value_formatter=None):
+    """Render a time series as a PNG and return its bytes. Blocking, run it in a thread.
+
+    matplotlib is imported lazily so the rest of the bot works without it;
+    an ImportError is raised if it is not installed. pyplot keeps global state
+    and is not thread-safe, so the figure is built and rendered without it.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+
+    # Reduce the series first so rendering cost and image size stay constant
+    timestamps, values = lttb(timestamps, values, MAX_PLOT_POINTS)
+    times = [datetime.fromtimestamp(timestamp) for timestamp in timestamps]
+
+    figure = Figure(figsize=(8, 3.5), dpi=100)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots()
+    axes.plot(times, values, color="#5865F2", linewidth=1.5)
+    axes.fill_between(times, values, color="#5865F2", alpha=0.15)
+    axes.set_title(title)
+    axes.set_ylabel(ylabel)
+    axes.grid(True, alpha=0.3)
+    if value_formatter:
+        axes.yaxis.set_major_formatter(FuncFormatter(lambda value, _: value_formatter(value)))
+    figure.autofmt_xdate()
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
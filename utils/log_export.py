@@ -0,0 +1,86 @@
+import io
+import zlib
+
+# Discord's upload limit for guilds without boosts
+DEFAULT_UPLOAD_LIMIT = 10 * 1024 * 1024
+
+# Room left below the cap for the final gzip flush and the request overhead
+FLUSH_MARGIN = 64 * 1024
+
+# First guess at how well Minecraft logs compress; corrected after a failed attempt
+INITIAL_COMPRESSION_RATIO = 8.0
+
+# Lines handed to the compressor per call
+CHUNK_LINES = 512
+
+def _compress_from(lines, start, limit):
+    """Gzip lines[start:] into a bounded buffer.
+
+    Returns (data, end, raw_bytes) where end is the index after the last line
+    written; end < len(lines) means the cap was reached.
+    """
+    buffer = io.BytesIO()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    raw_bytes = 0
+    end = start
+    while end < len(lines):
+        chunk = lines[end:end + CHUNK_LINES]
+        raw = ("\n".join(chunk) + "\n").encode("utf-8", "replace")
+        # Feed a copy, so a chunk that does not fit never reaches the stream we flush
+        trial = compressor.copy()
+        output = trial.compress(raw)
+        if buffer.tell() + len(output) > limit - FLUSH_MARGIN:
+            break
+        compressor = trial
+        buffer.write(output)
+        raw_bytes += len(raw)
+        end += len(chunk)
+    buffer.write(compressor.flush())
+    return buffer.getvalue(), end, raw_bytes
+
+def compress_log_lines(lines, max_bytes=DEFAULT_UPLOAD_LIMIT):
+    """Stream log lines through gzip into at most `max_bytes`, keeping the newest lines.
+
+    The newest lines matter most when debugging a crash, so the result always
+    ends at the last line and the start line is chosen from a compression
+    ratio estimate. If the estimate was too optimistic, the ratio seen so far
+    is used to skip more old lines and compress again. Should that still not
+    fit (e.g. the newest lines compress much worse than the older ones), the
+    start is found by bisection. Blocking, run it in a thread.
+
+    Returns (gzip_bytes, first_line_index, line_count).
+    """
+    ratio = INITIAL_COMPRESSION_RATIO
+    # Latest start known to overflow the cap; len(lines) always fits
+    too_early = -1
+    for _ in range(4):
+        # Walk backwards until the estimated compressed size would exceed the cap
+        budget = (max_bytes - FLUSH_MARGIN) * ratio
+        start = len(lines)
+        used = 0
+        while start > 0 and used + len(lines[start - 1]) + 1 <= budget:
+            start -= 1
+            used += len(lines[start]) + 1
+        if start <= too_early:
+            break
+
+        data, end, raw_bytes = _compress_from(lines, start, max_bytes)
+        if end >= len(lines):
+            return data, start, end - start
+        too_early = start
+        # Learn the real ratio from what fit and try again with a little slack
+        ratio = max(1.0, raw_bytes / max(1, len(data))) * 0.9
+
+    # Bisect between the last start that overflowed and one that fits, to
+    # within a thousandth of the lines so a huge log needs few passes
+    fits = len(lines)
+    data, _, _ = _compress_from(lines, fits, max_bytes)
+    tolerance = max(1, len(lines) // 1000)
+    while fits - too_early > tolerance:
+        start = (too_early + fits + 1) // 2
+        trial, end, _ = _compress_from(lines, start, max_bytes)
+        if end >= len(lines):
+            fits, data = start, trial
+        else:
+            too_early = start
+    return data, fits, len(lines) - fits
@@ -0,0 +1,335 @@
+import bisect
+import heapq
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from utils.api_helper import load_config
+from utils.units import parse_duration, parse_time_of_day
+
+# "[18:27:55] [Server thread/INFO]: message" (log file) and "[18:27:55 INFO]: message" (Paper console)
+LINE_PATTERN = re.compile(
+    r"^\[(\d{2}):(\d{2}):(\d{2})(?:\] \[([^\]]*?)/| )([A-Z]+)\]:? ?(.*)$"
+)
+
+# Lines that belong to the record before them (stack traces and their headers)
+CONTINUATION_PATTERN = re.compile(
+    r"^(?:\s+|at |Caused by: |Suppressed: |\.\.\. \d+ more|[\w$.]+(?:Exception|Error|Throwable)\b)"
+)
+
+# Log levels from least to most severe; aliases are normalized to these
+LEVELS = ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+LEVEL_ALIASES = {"WARNING": "WARN", "SEVERE": "ERROR", "FINE": "DEBUG"}
+LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+# Log timestamps have no date. A jump backwards by more than this means the
+# log crossed midnight; smaller steps back are threads logging out of order.
+ROLLOVER_THRESHOLD = 3600
+
+class LogRecord:
+    """One logical log entry, including any stack trace lines that followed it"""
+
+    __slots__ = ("line", "time", "thread", "level", "message", "extra")
+
+    def __init__(self, line, time, thread, level, message, extra=None):
+        # 0-based index of the record's first line in the log
+        self.line = line
+        # Seconds since midnight of the log's first day, or -1 for lines
+        # without a timestamp (ParsedLog adds the day offset when indexing)
+        self.time = time
+        self.thread = thread
+        self.level = level
+        self.message = message
+        self.extra = extra
+
+    def text(self):
+        """The record's full text as it appeared in the log"""
+        if self.time >= 0:
+            hours, rest = divmod(self.time % 86400, 3600)
+            stamp = f"[{hours:02d}:{rest // 60:02d}:{rest % 60:02d}]"
+            prefix = f"{stamp} [{self.thread}/{self.level}]: " if self.thread else f"{stamp} [{self.level}]: "
+        else:
+            prefix = ""
+        first = prefix + self.message
+        if not self.extra:
+            return first
+        return "\n".join((first,) + self.extra)
+
+    @property
+    def line_count(self):
+        return 1 + (len(self.extra) if self.extra else 0)
+
+def parse_line(index, line):
+    """Parse a single line into a LogRecord, or None if it has no timestamp header"""
+    match = LINE_PATTERN.match(line)
+    if not match:
+        return None
+    hours, minutes, seconds, thread, level, message = match.groups()
+    level = LEVEL_ALIASES.get(level, level)
+    return LogRecord(
+        index,
+        int(hours) * 3600 + int(minutes) * 60 + int(seconds),
+        # Thread and level names repeat on every line, so share one string object each
+        sys.intern(thread) if thread else "",
+        sys.intern(level),
+        message,
+    )
+
+class ParsedLog:
+    """Structured view of a server log with per-level and per-thread indexes.
+
+    Indexes hold record positions in compact arrays, so filtering by level or
+    thread touches only the matching records. Timestamped records are also
+    kept in a sorted time index of seconds since midnight of the log's first
+    day, which time window queries binary search.
+    """
+
+    def __init__(self, lines=()):
+        self.records = []
+        self.level_index = {}
+        self.thread_index = {}
+        self.times = array("q")
+        self.time_positions = array("I")
+        self.day_offset = 0
+        self.line_count = 0
+        self.extend(lines)
+
+    def _add(self, record):
+        """Append a record and index it.
+
+        Readers in other threads use the structures without a lock, so the
+        record is appended before any index points at it, and time_positions
+        grows before times (readers bound their lookups by len(times)).
+        """
+        timed = record.time >= 0
+        if timed:
+            times = self.times
+            absolute = record.time + self.day_offset
+            if times and absolute < times[-1] - ROLLOVER_THRESHOLD:
+                self.day_offset += 86400
+                absolute += 86400
+            record.time = absolute
+            # Clamp small out-of-order steps so the index stays sorted
+            if times and absolute < times[-1]:
+                absolute = times[-1]
+
+        position = len(self.records)
+        self.records.append(record)
+        if record.level:
+            self.level_index.setdefault(record.level, array("I")).append(position)
+        if record.thread:
+            self.thread_index.setdefault(record.thread, array("I")).append(position)
+        if timed:
+            self.time_positions.append(position)
+            self.times.append(absolute)
+
+    def extend(self, lines):
+        """Parse lines appended to the log and add them to the indexes"""
+        records = self.records
+        for line in lines:
+            index = self.line_count
+            self.line_count += 1
+            record = parse_line(index, line)
+            if record is None:
+                previous = records[-1] if records else None
+                if previous is not None and CONTINUATION_PATTERN.match(line):
+                    previous.extra = (previous.extra or ()) + (line,)
+                    continue
+                record = LogRecord(index, -1, "", "", line)
+            self._add(record)
+
+    def by_level(self, min_level):
+        """Records at `min_level` or more severe, in log order"""
+        rank = LEVEL_RANK.get(LEVEL_ALIASES.get(min_level, min_level), 0)
+        positions = [
+            positions for level, positions in self.level_index.items()
+            if LEVEL_RANK.get(level, len(LEVELS)) >= rank
+        ]
+        return [self.records[position] for position in heapq.merge(*positions)]
+
+    def by_thread(self, thread):
+        """Records logged by `thread`, in log order"""
+        return [self.records[position] for position in self.thread_index.get(thread, ())]
+
+    def tail(self, count, min_level=None):
+        """The last `count` records, optionally only those at `min_level` or above"""
+        if min_level is None:
+            return self.records[-count:] if count > 0 else []
+        rank = LEVEL_RANK.get(LEVEL_ALIASES.get(min_level, min_level), 0)
+        # Walk the matching index arrays backwards and merge only what is needed
+        positions = [
+            reversed(positions) for level, positions in self.level_index.items()
+            if LEVEL_RANK.get(level, len(LEVELS)) >= rank
+        ]
+        newest = []
+        for position in heapq.merge(*positions, reverse=True):
+            newest.append(position)
+            if len(newest) >= count:
+                break
+        return [self.records[position] for position in reversed(newest)]
+
+    @property
+    def latest_time(self):
+        """Absolute time of the newest timestamped record, or None"""
+        return self.times[-1] if self.times else None
+
+    def resolve_time_of_day(self, seconds):
+        """Map a wall clock time of day to the most recent matching absolute log time"""
+        latest = self.latest_time
+        if latest is None:
+            return seconds
+        candidate = (latest // 86400) * 86400 + seconds
+        if candidate > latest:
+            candidate -= 86400
+        return max(candidate, 0)
+
+    def to_epoch(self, absolute, now=None):
+        """Convert an absolute log time into a Unix timestamp.
+
+        Log lines only carry a time of day. The newest record is placed on
+        the most recent matching local wall-clock time, and older records are
+        offset from it. This assumes the bot and the server share a timezone.
+        """
+        if now is None:
+            now = time.time()
+        latest = self.latest_time
+        if latest is None:
+            return now
+        local = time.localtime(now)
+        midnight = now - (local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec)
+        latest_epoch = midnight + latest % 86400
+        if latest_epoch > now + 60:
+            latest_epoch -= 86400
+        return latest_epoch - (latest - absolute)
+
+    def resolve_time_spec(self, value):
+        """Turn "10m" (ago, relative to the newest record) or "14:30[:15]" into an absolute log time"""
+        seconds = parse_time_of_day(value)
+        if seconds is not None:
+            return self.resolve_time_of_day(seconds)
+        duration = parse_duration(value)
+        if duration is None or self.latest_time is None:
+            return None
+        return self.latest_time - duration
+
+    def between(self, start=None, end=None):
+        """Records with start <= absolute time <= end, found by binary search.
+
+        Untimestamped records (e.g. startup banners) are included when they
+        sit between two matching timestamped records.
+        """
+        times = self.times
+        if not times:
+            return []
+        low = 0 if start is None else bisect.bisect_left(times, start)
+        high = len(times) if end is None else bisect.bisect_right(times, end)
+        if low >= high:
+            return []
+        first = self.time_positions[low]
+        # Extend to just before the next timestamped record to keep trailing plain lines
+        last = self.time_positions[high] if high < len(times) else len(self.records)
+        return self.records[first:last]
+
+    def level_counts(self):
+        return {level: len(positions) for level, positions in self.level_index.items()}
+
+def appended_lines(before, after):
+    """Lines of `after` that come after its overlap with `before`.
+
+    Crafty's stdout buffer only keeps the newest lines, so two reads of it
+    overlap: the longest suffix of `before` that is also a prefix of `after`
+    is what both saw. Returns (new_lines, overlapped); without any overlap
+    every line of `after` is new. Runs of identical lines are ambiguous and
+    count as already seen.
+    """
+    for size in range(min(len(before), len(after)), 0, -1):
+        if before[-1] == after[size - 1] and before[-size:] == after[:size]:
+            return after[size:], True
+    return list(after), False
+
+class LogCache:
+    """Keeps one ParsedLog per server and only parses lines appended since the last fetch.
+
+    A parsed log takes about three times the memory of its text, so the cache
+    holds at most `max_lines` lines in total and drops the least recently
+    used servers beyond that. The log watcher also forgets servers that stop
+    or leave the server index.
+    """
+
+    def __init__(self, max_lines=200000):
+        self.max_lines = max_lines
+        self.logs = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(load_config().get("log_cache", {}).get("max_lines", 200000))
+
+    def update(self, server_id, lines):
+        """Bring the server's ParsedLog up to date with a fresh log snapshot.
+
+        Returns (parsed_log, new_lines). If the log was rotated or truncated,
+        the whole snapshot is parsed again and every line counts as new.
+        """
+        parsed, new_lines, _, _ = self.update_records(server_id, lines)
+        return parsed, new_lines
+
+    def update_records(self, server_id, lines):
+        """Like update, but returns (parsed_log, new_lines, new_records, rotated).
+
+        new_records are the records created by this update; a stack trace line
+        that extends an older record does not produce a new one.
+        """
+        server_id = str(server_id)
+        # Updates may run in worker threads, keep them from interleaving
+        with self.lock:
+            entry = self.logs.get(server_id)
+            if entry is not None:
+                parsed, first_line, last_line = entry
+                seen = parsed.line_count
+                if seen and len(lines) >= seen and lines[0] == first_line and lines[seen - 1] == last_line:
+                    new_lines = lines[seen:]
+                    known_records = len(parsed.records)
+                    parsed.extend(new_lines)
+                    if new_lines:
+                        self.logs[server_id] = (parsed, first_line, new_lines[-1])
+                    self._touch(server_id)
+                    return parsed, new_lines, parsed.records[known_records:], False
+
+            parsed = ParsedLog(lines)
+            if lines:
+                self.logs[server_id] = (parsed, lines[0], lines[-1])
+                self._touch(server_id)
+            else:
+                self.logs.pop(server_id, None)
+            return parsed, list(lines), parsed.records, entry is not None
+
+    def _touch(self, server_id):
+        """Mark a server as most recently used and evict the oldest logs over the cap"""
+        self.logs.move_to_end(server_id)
+        total = sum(entry[0].line_count for entry in self.logs.values())
+        while total > self.max_lines and len(self.logs) > 1:
+            oldest, entry = next(iter(self.logs.items()))
+            if oldest == server_id:
+                break
+            del self.logs[oldest]
+            total -= entry[0].line_count
+
+    def get(self, server_id):
+        entry = self.logs.get(str(server_id))
+        return entry[0] if entry else None
+
+    def forget(self, server_id):
+        with self.lock:
+            self.logs.pop(str(server_id), None)
+
+    def retain(self, server_ids):
+        """Forget every server not in `server_ids`"""
+        keep = {str(server_id) for server_id in server_ids}
+        with self.lock:
+            for server_id in [server_id for server_id in list(self.logs) if server_id not in keep]:
+                del self.logs[server_id]
+
+log_cache = LogCache.from_config()
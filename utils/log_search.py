@@ -0,0 +1,58 @@
+import re
+import time
+from functools import lru_cache
+
+# How often (in lines) the scan checks its time budget
+DEADLINE_CHECK_INTERVAL = 2048
+
+@lru_cache(maxsize=64)
+def compile_pattern(pattern, regex=False, ignore_case=True):
+    """Compile a search pattern once and reuse it for repeated searches.
+
+    Plain patterns are escaped so they match as a substring. Raises re.error
+    for invalid regular expressions.
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.compile(pattern if regex else re.escape(pattern), flags)
+
+class SearchResult:
+    """Matches of a log search and whether the scan stopped early"""
+
+    __slots__ = ("matches", "scanned", "total", "hit_match_limit", "timed_out")
+
+    def __init__(self, matches, scanned, total, hit_match_limit, timed_out):
+        # Each match is (line_number, [(line_number, line), ...]) with its context
+        self.matches = matches
+        self.scanned = scanned
+        self.total = total
+        self.hit_match_limit = hit_match_limit
+        self.timed_out = timed_out
+
+def search_lines(lines, compiled, max_matches=20, context=1, time_budget=2.0):
+    """Scan log lines for a compiled pattern. Blocking, run it in a thread for big logs.
+
+    Stops after `max_matches` matches or `time_budget` seconds, whichever comes first.
+    Line numbers are 1-based.
+    """
+    deadline = time.monotonic() + time_budget
+    search = compiled.search
+    matches = []
+    total = len(lines)
+    hit_match_limit = False
+    timed_out = False
+    scanned = 0
+
+    for index, line in enumerate(lines):
+        scanned = index + 1
+        if search(line):
+            start = max(0, index - context)
+            end = min(total, index + context + 1)
+            matches.append((index + 1, [(number + 1, lines[number]) for number in range(start, end)]))
+            if len(matches) >= max_matches:
+                hit_match_limit = True
+                break
+        if index % DEADLINE_CHECK_INTERVAL == 0 and time.monotonic() > deadline:
+            timed_out = True
+            break
+
+    return SearchResult(matches, scanned, total, hit_match_limit, timed_out)
@@ -0,0 +1,116 @@
+import asyncio
+from discord.ext import tasks
+from utils.api_helper import STDOUT_LOG_PARAMS, get_server_logs, load_config
+from utils.scheduler import Priority, request_priority, run_in_background
+from utils.log_parser import ParsedLog, appended_lines, log_cache
+from utils.server_index import server_index
+from utils.stats_history import stats_history
+
+class LogWatcher:
+    """Polls the logs of running servers and hands newly appended records to listeners.
+
+    Each poll reads Crafty's stdout buffer, which only holds the newest lines,
+    instead of the whole log file, so a poll costs the same however long the
+    log grows. The new lines are found by the buffer's overlap with the
+    previous read and parsed on their own. Listeners are called as
+    listener(server_id, parsed_log, new_records, rotated), where parsed_log
+    holds just the new records and rotated means the buffer started over.
+    """
+
+    def __init__(self, max_concurrent=4):
+        self.listeners = []
+        self.max_concurrent = max_concurrent
+        # server_id -> the stdout buffer lines of the previous poll
+        self.cursors = {}
+
+    def subscribe(self, listener):
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _advance(self, server_id, lines):
+        """Diff a fresh stdout buffer against the previous one and return (parsed, new records, rotated)"""
+        previous = self.cursors.get(server_id)
+        self.cursors[server_id] = lines
+        if previous is None:
+            new_lines, rotated = lines, False
+        else:
+            new_lines, overlapped = appended_lines(previous, lines)
+            # No shared lines and a shorter buffer: Crafty started it over for a new process
+            rotated = not overlapped and len(lines) < len(previous)
+        parsed = ParsedLog(new_lines)
+        return parsed, parsed.records, rotated
+
+    def forget(self, server_id):
+        """Drop the cursor and cached log of a server"""
+        self.cursors.pop(str(server_id), None)
+        log_cache.forget(server_id)
+
+    def on_stats(self, server_id, previous, stats, timestamp):
+        # A stopped server's buffer and log start over on the next run
+        if previous is not None and previous[1].running and not stats.running:
+            self.forget(server_id)
+
+    def on_servers(self, servers):
+        """Server index listener: forget servers that left the index"""
+        keep = {server.server_id for server in servers}
+        for server_id in [server_id for server_id in list(self.cursors) if server_id not in keep]:
+            del self.cursors[server_id]
+        log_cache.retain(keep)
+
+    async def poll(self, server_id, priority=Priority.WATCHER):
+        """Fetch one server's stdout buffer, dispatch the new records and return them"""
+        # Only interactive polls may use the default executor that commands share
+        run = asyncio.to_thread if priority == Priority.INTERACTIVE else run_in_background
+        with request_priority(priority):
+            data = await run(get_server_logs, server_id, STDOUT_LOG_PARAMS)
+        if data.get("status") != "ok":
+            return []
+
+        server_id = str(server_id)
+        parsed, new_records, rotated = await run(self._advance, server_id, data["data"].lines)
+        if new_records or rotated:
+            for listener in list(self.listeners):
+                try:
+                    listener(server_id, parsed, new_records, rotated)
+                except Exception as e:
+                    print(f"Error in log listener {getattr(listener, '__name__', listener)}: {e}")
+        return new_records
+
+    def watched_servers(self):
+        """Servers the last stats sample saw running"""
+        return [
+            server_id for server_id, (_, stats) in stats_history.latest.items()
+            if stats.running
+        ]
+
+    async def poll_all(self):
+        limit = asyncio.Semaphore(self.max_concurrent)
+
+        async def poll_one(server_id):
+            async with limit:
+                try:
+                    await self.poll(server_id)
+                except Exception as e:
+                    print(f"Error watching logs of server {server_id}: {e}")
+
+        await asyncio.gather(*(poll_one(server_id) for server_id in self.watched_servers()))
+
+log_watcher = LogWatcher(load_config().get("log_watcher", {}).get("max_concurrent", 4))
+stats_history.subscribe(log_watcher.on_stats)
+server_index.subscribe(log_watcher.on_servers)
+
+@tasks.loop(seconds=15)
+async def log_watcher_loop():
+    await log_watcher.poll_all()
+
+def start_log_watcher():
+    """Start polling the logs of running servers using the interval from config.json"""
+    if log_watcher_loop.is_running():
+        return
+    interval = load_config().get("log_watcher", {}).get("interval_seconds", 15)
+    log_watcher_loop.change_interval(seconds=interval)
+    log_watcher_loop.start()
@@ -0,0 +1,74 @@
+import time
+from utils.api_helper import load_config, subscribe_actions
+from utils.server_index import server_index
+from utils.stats_history import stats_history
+
+# Power and backup actions leave a server's metadata alone; any other action
+# (e.g. update_executable) may change it
+UNCHANGED_BY_ACTIONS = frozenset({"start_server", "stop_server", "restart_server", "kill_server", "backup_server"})
+
+class MetadataCache:
+    """Long-lived ServerInfo of every server, so commands rarely ask Crafty for it.
+
+    The whole cache is refilled whenever the server index is rebuilt from
+    get_all_servers. Single servers are added after a get_server_info miss.
+    An entry is dropped after `ttl` seconds, after an action that may change the
+    server, or when the stats collector reports a different name for it.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self.entries = {}
+
+    @classmethod
+    def from_config(cls):
+        return cls(load_config().get("metadata_cache", {}).get("ttl_seconds", 3600))
+
+    def fill(self, servers, stored_at=None):
+        """Replace the cache with a full server list; servers missing from it are dropped"""
+        if stored_at is None:
+            stored_at = time.time()
+        self.entries = {server.server_id: (stored_at, server) for server in servers}
+
+    def put(self, server):
+        self.entries[server.server_id] = (time.time(), server)
+
+    def get(self, server_id):
+        """The cached ServerInfo of a server, or None if missing or expired"""
+        server_id = str(server_id)
+        entry = self.entries.get(server_id)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl:
+            self.entries.pop(server_id, None)
+            return None
+        return entry[1]
+
+    def get_name(self, server_id):
+        server = self.get(server_id)
+        return server.server_name if server else None
+
+    def invalidate(self, server_id=None):
+        """Drop one server, or everything when no server_id is given"""
+        if server_id is None:
+            self.entries = {}
+        else:
+            self.entries.pop(str(server_id), None)
+
+    def on_action(self, server_id, action):
+        if action not in UNCHANGED_BY_ACTIONS:
+            self.invalidate(server_id)
+
+    def on_stats(self, server_id, previous, stats, timestamp):
+        # The stats payload carries the server's name, so a rename shows up here first
+        entry = self.entries.get(server_id)
+        if entry is not None and stats.server_name and stats.server_name != entry[1].server_name:
+            self.invalidate(server_id)
+
+metadata_cache = MetadataCache.from_config()
+if server_index.servers:
+    # The index may already hold a restored snapshot or a finished refresh
+    metadata_cache.fill(server_index.export(), server_index.last_refresh)
+server_index.subscribe(metadata_cache.fill)
+stats_history.subscribe(metadata_cache.on_stats)
+subscribe_actions(metadata_cache.on_action)
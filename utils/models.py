@@ -0,0 +1,140 @@
+import sys
+from utils.units import parse_size
+
+def _intern(value):
+    """Intern short strings that repeat across servers and polls (types, versions, names)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+class ServerInfo:
+    """The parts of a Crafty server object the bot uses, parsed once"""
+
+    __slots__ = ("server_id", "server_name", "type", "server_ip", "server_port", "executable", "backup_path", "panel")
+
+    def __init__(self, server_id, server_name, type="Unknown", server_ip=None, server_port=None,
+                 executable=None, backup_path=None, panel=None):
+        self.server_id = server_id
+        self.server_name = server_name
+        self.type = type
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.executable = executable
+        self.backup_path = backup_path
+        self.panel = panel
+
+    @classmethod
+    def from_payload(cls, data):
+        """Build from a Crafty server object (or a dict written by to_dict)"""
+        server_id = str(data.get("server_id"))
+        return cls(
+            server_id,
+            _intern(data.get("server_name") or f"Server {server_id}"),
+            _intern(data.get("type") or "Unknown"),
+            _intern(data.get("server_ip")),
+            _int(data.get("server_port"), None),
+            data.get("executable"),
+            data.get("backup_path"),
+            _intern(data.get("panel")),
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+class ServerStats:
+    """One stats sample of a server with sizes in bytes.
+
+    Crafty embeds the whole server object (paths, execution command, ...)
+    under `server_id` in every stats payload; only the ID and name are kept.
+    """
+
+    __slots__ = ("server_id", "server_name", "running", "crashed", "waiting_start", "updating", "backing_up",
+                 "cpu", "mem", "mem_percent", "online", "max", "players", "world_size", "version",
+                 "started", "desc")
+
+    def __init__(self, server_id=None, server_name=None, running=False, crashed=False, waiting_start=False,
+                 updating=False, backing_up=None, cpu=0.0, mem=0, mem_percent=0.0, online=0, max=0,
+                 players=(), world_size=0, version=None, started=None, desc=None):
+        self.server_id = server_id
+        self.server_name = server_name
+        self.running = running
+        self.crashed = crashed
+        self.waiting_start = waiting_start
+        self.updating = updating
+        self.backing_up = backing_up
+        self.cpu = cpu
+        self.mem = mem
+        self.mem_percent = mem_percent
+        self.online = online
+        self.max = max
+        self.players = players
+        self.world_size = world_size
+        self.version = version
+        self.started = started
+        self.desc = desc
+
+    @classmethod
+    def from_payload(cls, data, server_id=None):
+        """Build from a Crafty stats payload (or a dict written by to_dict)"""
+        server = data.get("server_id")
+        server_name = data.get("server_name")
+        if isinstance(server, dict):
+            server_name = server.get("server_name")
+            server = server.get("server_id")
+        if server_id is None and server is not None:
+            server_id = str(server)
+
+        players = data.get("players") or ()
+        if isinstance(players, str):
+            # Crafty sends the player list as a Python-style list string, e.g. "['Steve', 'Alex']"
+            players = [name.strip(" '\"") for name in players.strip("[]").split(",")]
+        backing_up = data.get("backing_up")
+
+        return cls(
+            server_id,
+            _intern(server_name),
+            bool(data.get("running", False)),
+            bool(data.get("crashed", False)),
+            bool(data.get("waiting_start", False)),
+            bool(data.get("updating", False)),
+            None if backing_up is None else bool(backing_up),
+            _float(data.get("cpu")),
+            parse_size(data.get("mem"), 0),
+            _float(data.get("mem_percent")),
+            _int(data.get("online")),
+            _int(data.get("max")),
+            tuple(_intern(name) for name in players if name),
+            parse_size(data.get("world_size"), 0),
+            _intern(data.get("version")),
+            data.get("started"),
+            data.get("desc"),
+        )
+
+    def to_dict(self):
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["players"] = list(self.players)
+        return state
+
+class LogResponse:
+    """The lines of a server log as returned by Crafty"""
+
+    __slots__ = ("server_id", "lines")
+
+    def __init__(self, server_id, lines):
+        self.server_id = server_id
+        self.lines = lines
+
+    @classmethod
+    def from_payload(cls, data, server_id=None):
+        lines = data if isinstance(data, list) else []
+        return cls(server_id, lines)
@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+
+def _is_crafty_error(body):
+    """Whether a response body is Crafty's own {"status": "error", ...} envelope"""
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and data.get("status") == "error"
+
+class NegativeCache:
+    """Remembers for a short while which server IDs Crafty could not serve.
+
+    A 404 means the ID does not exist on the panel; a 5xx on a per-server
+    endpoint usually means the server is unloaded. Either way, asking again a
+    second later gives the same answer, so repeated lookups of that ID are
+    answered from here until the entry expires or the server list is refreshed.
+    A 5xx is only remembered when Crafty itself sent it as a JSON error; a
+    502/503/504 from a reverse proxy in front of the panel is usually gone on
+    the next try. Connection errors are not remembered, since they concern
+    the whole panel.
+    """
+
+    def __init__(self, ttl=15):
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def classify(status_code, body=None):
+        """The reason to remember a response ("not_found" or "unavailable"), or None"""
+        if status_code == 404:
+            return "not_found"
+        if status_code >= 500 and _is_crafty_error(body):
+            return "unavailable"
+        return None
+
+    def get(self, server_id):
+        """The remembered error response for a server ID, or None"""
+        server_id = str(server_id)
+        entry = self.entries.get(server_id)
+        if entry is None:
+            return None
+        expires, result = entry
+        if time.monotonic() >= expires:
+            with self.lock:
+                if self.entries.get(server_id) is entry:
+                    del self.entries[server_id]
+            return None
+        return dict(result)
+
+    def remember(self, server_id, status_code, body=None):
+        """Store an error response for a server if it is worth remembering. Returns it or None."""
+        reason = self.classify(status_code, body)
+        if reason is None:
+            return None
+        server_id = str(server_id)
+        if reason == "not_found":
+            message = f"No server with ID {server_id} was found"
+        else:
+            message = f"Server {server_id} is unavailable, is the server unloaded?"
+        result = {"status": "error", "error": reason.upper(), "message": message}
+        with self.lock:
+            self.entries[server_id] = (time.monotonic() + self.ttl, result)
+        return dict(result)
+
+    def forget(self, server_id):
+        with self.lock:
+            self.entries.pop(str(server_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
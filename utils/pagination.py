@@ -0,0 +1,101 @@
+from collections import OrderedDict
+import discord
+from discord.ui import View, Button, Modal, TextInput
+
+class JumpModal(Modal, title="Jump to page"):
+    page = TextInput(label="Page number", max_length=6)
+
+    def __init__(self, pager):
+        super().__init__()
+        self.pager = pager
+        self.page.placeholder = f"1-{pager.page_count}"
+
+    async def on_submit(self, interaction: discord.Interaction):
+        value = self.page.value.strip()
+        if not value.isdigit() or not 1 <= int(value) <= self.pager.page_count:
+            await interaction.response.send_message(
+                f"Please enter a page number between 1 and {self.pager.page_count}.", ephemeral=True
+            )
+            return
+        await self.pager.show(interaction, int(value) - 1)
+
+class PagedView(View):
+    """Prev/Next/Jump navigation over pages that are built on demand.
+
+    `build_page(index)` returns the embed for a zero-based page index. It is
+    only called for pages that are actually viewed, and built pages are kept
+    in a small LRU cache, so flipping back and forth costs nothing. The pages
+    should be built from a snapshot taken when the command ran; paging never
+    goes back to Crafty.
+    """
+
+    def __init__(self, page_count, build_page, start_page=0, owner_id=None, timeout=300, cache_size=16):
+        super().__init__(timeout=timeout)
+        self.page_count = max(1, page_count)
+        self.build_page = build_page
+        self.current_page = min(max(0, start_page), self.page_count - 1)
+        self.owner_id = owner_id
+        self.cache_size = cache_size
+        self.pages = OrderedDict()
+        self.message = None
+        self.update_buttons()
+
+    def get_page(self, index):
+        embed = self.pages.get(index)
+        if embed is None:
+            embed = self.build_page(index)
+            self.pages[index] = embed
+            if len(self.pages) > self.cache_size:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(index)
+        return embed
+
+    def current_embed(self):
+        return self.get_page(self.current_page)
+
+    def update_buttons(self):
+        self.prev_button.disabled = self.current_page <= 0
+        self.next_button.disabled = self.current_page >= self.page_count - 1
+        self.jump_button.disabled = self.page_count <= 1
+        self.page_label.label = f"{self.current_page + 1}/{self.page_count}"
+
+    async def show(self, interaction: discord.Interaction, index):
+        self.current_page = min(max(0, index), self.page_count - 1)
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.current_embed(), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        # Only the user who ran the command can flip its pages
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("Run the command yourself to browse these pages.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        # Disable all buttons when the view times out, the page stays visible
+        for item in self.children:
+            item.disabled = True
+        self.pages.clear()
+
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except Exception as e:
+                print(f"Error updating timed out pager message: {e}")
+
+    @discord.ui.button(label="◀️ Prev", style=discord.ButtonStyle.primary)
+    async def prev_button(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.current_page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_label(self, interaction: discord.Interaction, button: Button):
+        pass
+
+    @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.primary)
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        await self.show(interaction, self.current_page + 1)
+
+    @discord.ui.button(label="🔢 Jump", style=discord.ButtonStyle.secondary)
+    async def jump_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(JumpModal(self))
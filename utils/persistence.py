@@ -0,0 +1,206 @@
+import json
+import queue
+import sqlite3
+import threading
+import time
+from discord.ext import tasks
+from utils.api_helper import load_config
+from utils.models import ServerInfo, ServerStats
+from utils.server_index import server_index
+from utils.stats_history import stats_history
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    server_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    server_id TEXT PRIMARY KEY,
+    updated REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    server_id TEXT NOT NULL,
+    tier INTEGER NOT NULL,
+    meta TEXT NOT NULL,
+    timestamps BLOB NOT NULL,
+    series BLOB NOT NULL,
+    PRIMARY KEY (server_id, tier)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Sentinel telling the writer thread to exit
+_STOP = object()
+
+class SnapshotStore:
+    """SQLite (WAL) store of the last known fleet state.
+
+    All writes go through a single background thread that drains its queue
+    and applies everything it found in one transaction, so a checkpoint is a
+    handful of executemany calls instead of one commit per row.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = None
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent with NORMAL; FULL would fsync every commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._writer, name="snapshot-writer", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join(timeout=10)
+            self.thread = None
+
+    def write(self, sql, rows):
+        """Queue an executemany for the writer thread"""
+        self.queue.put((sql, rows))
+
+    def _writer(self):
+        connection = self._connect()
+        try:
+            while True:
+                batch = [self.queue.get()]
+                # Take everything that piled up and write it in one transaction
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(item is _STOP for item in batch)
+                try:
+                    with connection:
+                        for item in batch:
+                            if item is not _STOP:
+                                connection.executemany(*item)
+                except Exception as e:
+                    print(f"Error writing snapshot: {e}")
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def checkpoint(self, servers, latest_stats, histories):
+        """Queue a full snapshot of the server list, latest stats and stats history"""
+        # Forget servers that disappeared since the last checkpoint
+        known_ids = [(json.dumps([server.server_id for server in servers]),)]
+        for table in ("servers", "stats", "history"):
+            self.write(f"DELETE FROM {table} WHERE server_id NOT IN (SELECT value FROM json_each(?))", known_ids)
+        self.write("INSERT OR REPLACE INTO servers (server_id, data) VALUES (?, ?)",
+                   [(server.server_id, json.dumps(server.to_dict())) for server in servers])
+        self.write("INSERT OR REPLACE INTO stats (server_id, updated, data) VALUES (?, ?, ?)",
+                   [(server_id, updated, json.dumps(stats.to_dict())) for server_id, (updated, stats) in latest_stats.items()])
+
+        history_rows = []
+        for server_id, history in histories.items():
+            for tier_number, tier in enumerate(history.tiers):
+                state = tier.to_state()
+                timestamps = state.pop("timestamps")
+                series = state.pop("values")
+                history_rows.append((server_id, tier_number, json.dumps(state), timestamps, series))
+        self.write("INSERT OR REPLACE INTO history (server_id, tier, meta, timestamps, series) VALUES (?, ?, ?, ?, ?)",
+                   history_rows)
+        self.write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                   [("checkpoint_at", str(time.time()))])
+
+    def load(self):
+        """Read the last snapshot. Returns (servers, latest_stats, history_states)."""
+        connection = self._connect()
+        try:
+            servers = [ServerInfo.from_payload(json.loads(data)) for (data,) in connection.execute("SELECT data FROM servers")]
+            latest_stats = {
+                server_id: (updated, ServerStats.from_payload(json.loads(data), server_id))
+                for server_id, updated, data in connection.execute("SELECT server_id, updated, data FROM stats")
+            }
+            history_states = {}
+            rows = connection.execute("SELECT server_id, tier, meta, timestamps, series FROM history ORDER BY server_id, tier")
+            for server_id, tier_number, meta, timestamps, series in rows:
+                state = json.loads(meta)
+                state["timestamps"] = timestamps
+                state["values"] = series
+                history_states.setdefault(server_id, []).append(state)
+            return servers, latest_stats, history_states
+        finally:
+            connection.close()
+
+snapshot_store = None
+
+def rehydrate():
+    """Open the snapshot database and load the last known fleet state into memory"""
+    global snapshot_store
+    snapshot_config = load_config().get("snapshot", {})
+    if not snapshot_config.get("enabled", True):
+        return False
+
+    try:
+        snapshot_store = SnapshotStore(snapshot_config.get("path", "crafty_bot.sqlite3"))
+        servers, latest_stats, history_states = snapshot_store.load()
+    except Exception as e:
+        print(f"Error loading snapshot: {e}")
+        return False
+
+    if servers and not server_index.servers:
+        server_index.rebuild(servers)
+    for server_id, entry in latest_stats.items():
+        stats_history.latest.setdefault(server_id, entry)
+    for server_id, tier_states in history_states.items():
+        stats_history.restore(server_id, tier_states)
+    print(f"Restored snapshot: {len(servers)} servers, {len(history_states)} histories")
+    return True
+
+def checkpoint_now():
+    """Queue a snapshot of the current in-memory state"""
+    if snapshot_store is None:
+        return
+    servers = server_index.export()
+    if not servers:
+        # Never overwrite a good snapshot with an empty one before the first refresh
+        return
+    snapshot_store.checkpoint(servers, dict(stats_history.latest), dict(stats_history.servers))
+
+@tasks.loop(seconds=60)
+async def snapshot_writer():
+    try:
+        checkpoint_now()
+    except Exception as e:
+        print(f"Error creating snapshot: {e}")
+
+def stop_snapshots():
+    """Write a final snapshot and wait for the writer thread to finish"""
+    if snapshot_store is None:
+        return
+    if snapshot_writer.is_running():
+        snapshot_writer.cancel()
+    checkpoint_now()
+    snapshot_store.stop()
+
+def start_snapshots():
+    """Start the writer thread and the periodic checkpoint loop"""
+    if snapshot_store is None or snapshot_writer.is_running():
+        return
+    snapshot_store.start()
+    interval = load_config().get("snapshot", {}).get("interval_seconds", 60)
+    snapshot_writer.change_interval(seconds=interval)
+    snapshot_writer.start()
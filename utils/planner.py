@@ -0,0 +1,128 @@
+import asyncio
+from utils.api_helper import get_server_info, get_server_stats, get_server_logs, load_config
+from utils.stats_history import stats_history
+from utils.metadata_cache import metadata_cache
+
+# Cached stats younger than this may answer a plan's stats lookup (see RequestPlan.stats)
+STATS_MAX_AGE = load_config().get("planner", {}).get("stats_max_age_seconds", 15)
+
+FETCHERS = {
+    "info": get_server_info,
+    "stats": get_server_stats,
+    "logs": get_server_logs,
+}
+
+def _is_running(stats_response):
+    return stats_response.get("status") == "ok" and stats_response["data"].running
+
+class PlanResult:
+    """The responses of a finished RequestPlan, keyed by need. Skipped needs are None."""
+
+    __slots__ = ("responses",)
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def response(self, name):
+        return self.responses.get(name)
+
+    def ok(self, name):
+        response = self.responses.get(name)
+        return response is not None and response.get("status") == "ok"
+
+    def data(self, name):
+        """The parsed model of a successful response, or None"""
+        return self.responses[name]["data"] if self.ok(name) else None
+
+class RequestPlan:
+    """The data a command needs about one server, fetched with as much overlap as possible.
+
+    Every need runs in its own thread at the same time, so a command waits for
+    its slowest request rather than for the sum of them. Info is answered from
+    the metadata cache when it has the server, and stats from the stats
+    collector when recent enough. Logs can be tied to the server
+    running: if the last known state says it is offline they wait for the stats
+    and are skipped when it really is; otherwise they are fetched right away and
+    dropped if the stats show the server is down.
+
+        result = await RequestPlan(server_id).info().stats(max_age=15).logs(only_if_running=True).run()
+    """
+
+    def __init__(self, server_id):
+        self.server_id = str(server_id)
+        self.needs = {}
+
+    def info(self):
+        self.needs["info"] = {}
+        return self
+
+    def stats(self, max_age=None):
+        """Need the server's stats; max_age allows a cached sample that recent (None always fetches)"""
+        self.needs["stats"] = {"max_age": max_age}
+        return self
+
+    def logs(self, only_if_running=False):
+        self.needs["logs"] = {"only_if_running": only_if_running}
+        if only_if_running:
+            # Whether the server runs comes from its stats, so those are needed as well
+            self.needs.setdefault("stats", {"max_age": STATS_MAX_AGE})
+        return self
+
+    def _cached_stats(self):
+        max_age = self.needs["stats"]["max_age"]
+        if max_age is None:
+            return None
+        cached = stats_history.get_latest(self.server_id, max_age=max_age)
+        return {"status": "ok", "data": cached[1]} if cached is not None else None
+
+    def _probably_running(self, stats_response):
+        if stats_response is not None:
+            return _is_running(stats_response)
+        last_known = stats_history.get_latest(self.server_id)
+        return last_known is None or last_known[1].running
+
+    def _fetch(self, name):
+        return asyncio.create_task(asyncio.to_thread(FETCHERS[name], self.server_id))
+
+    async def run(self):
+        responses = {}
+        tasks = {}
+        if "stats" in self.needs:
+            responses["stats"] = self._cached_stats()
+            if responses["stats"] is None:
+                tasks["stats"] = self._fetch("stats")
+        if "info" in self.needs:
+            cached = metadata_cache.get(self.server_id)
+            if cached is not None:
+                responses["info"] = {"status": "ok", "data": cached}
+            else:
+                tasks["info"] = self._fetch("info")
+
+        conditional = "logs" in self.needs and self.needs["logs"]["only_if_running"]
+        deferred = False
+        if "logs" in self.needs:
+            if not conditional or self._probably_running(responses["stats"]):
+                # Probably running, so the logs are fetched alongside the stats
+                tasks["logs"] = self._fetch("logs")
+            else:
+                deferred = True
+
+        try:
+            if deferred and "stats" in tasks:
+                # Only fresh stats can tell whether the logs are worth fetching
+                responses["stats"] = await tasks.pop("stats")
+            if deferred and _is_running(responses["stats"]):
+                tasks["logs"] = self._fetch("logs")
+
+            names = list(tasks)
+            for name, response in zip(names, await asyncio.gather(*tasks.values())):
+                responses[name] = response
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        if "info" in tasks and responses["info"].get("status") == "ok":
+            metadata_cache.put(responses["info"]["data"])
+        if conditional and not _is_running(responses["stats"]):
+            responses["logs"] = None
+        return PlanResult(responses)
@@ -0,0 +1,116 @@
+import re
+import time
+from collections import deque
+from utils.log_watcher import log_watcher
+from utils.stats_history import stats_history
+
+# Player names are 3-16 word characters; Geyser/Floodgate prefixes them with "." or "*"
+JOIN_PATTERN = re.compile(r"^([.*]?\w{1,16}) joined the game")
+LEAVE_PATTERN = re.compile(r"^([.*]?\w{1,16}) left the game")
+LOST_CONNECTION_PATTERN = re.compile(r"^([.*]?\w{1,16}) lost connection: (.*)")
+STOPPING_PATTERN = re.compile(r"^Stopping (?:the )?server")
+
+# How many finished sessions and joins are remembered per server
+RECENT_LIMIT = 50
+
+class PlayerSession:
+    """A single stay of a player on a server"""
+
+    __slots__ = ("name", "joined", "left", "reason")
+
+    def __init__(self, name, joined, left=None, reason=None):
+        self.name = name
+        self.joined = joined
+        self.left = left
+        self.reason = reason
+
+    def duration(self, now=None):
+        end = self.left if self.left is not None else (now or time.time())
+        return max(0, end - self.joined)
+
+class ServerPlayers:
+    """Who is online on one server, plus recently finished sessions and joins"""
+
+    __slots__ = ("online", "recent_sessions", "recent_joins", "disconnect_reasons", "total_sessions")
+
+    def __init__(self):
+        self.online = {}
+        self.recent_sessions = deque(maxlen=RECENT_LIMIT)
+        self.recent_joins = deque(maxlen=RECENT_LIMIT)
+        self.disconnect_reasons = {}
+        self.total_sessions = 0
+
+    def join(self, name, when):
+        # A second join without a leave means we missed the leave line
+        if name in self.online:
+            self.leave(name, when, "rejoined")
+        self.online[name] = PlayerSession(name, when)
+        self.recent_joins.append((name, when))
+
+    def leave(self, name, when, reason=None):
+        session = self.online.pop(name, None)
+        if session is None:
+            return
+        session.left = when
+        session.reason = reason or self.disconnect_reasons.pop(name, None)
+        self.recent_sessions.append(session)
+        self.total_sessions += 1
+
+    def close_all(self, when, reason):
+        for name in list(self.online):
+            self.leave(name, when, reason)
+
+class PlayerSessionIndex:
+    """Per-server player sessions built incrementally from new log records"""
+
+    def __init__(self):
+        self.servers = {}
+
+    def get(self, server_id):
+        return self.servers.get(str(server_id))
+
+    def on_log_records(self, server_id, parsed, new_records, rotated):
+        """LogWatcher listener: apply join/leave events from newly appended records"""
+        server_id = str(server_id)
+        players = self.servers.get(server_id)
+        now = time.time()
+        if players is None:
+            players = self.servers[server_id] = ServerPlayers()
+        elif rotated:
+            # A new log file means the server restarted, so nobody is online anymore
+            players.close_all(now, "server restarted")
+
+        for record in new_records:
+            if record.time < 0 or record.level != "INFO":
+                continue
+            message = record.message
+            match = JOIN_PATTERN.match(message)
+            if match:
+                players.join(match.group(1), parsed.to_epoch(record.time, now))
+                continue
+            match = LOST_CONNECTION_PATTERN.match(message)
+            if match:
+                players.disconnect_reasons[match.group(1)] = match.group(2)
+                continue
+            match = LEAVE_PATTERN.match(message)
+            if match:
+                players.leave(match.group(1), parsed.to_epoch(record.time, now))
+                continue
+            if STOPPING_PATTERN.match(message):
+                players.close_all(parsed.to_epoch(record.time, now), "server stopped")
+
+    def on_stats(self, server_id, previous, stats, timestamp):
+        """Stats listener: close every session when a server goes from running to stopped.
+
+        A crash or kill never logs "Stopping server", so the stats are the only
+        sign that everyone left.
+        """
+        if previous is None or not previous[1].running or stats.running:
+            return
+        players = self.servers.get(str(server_id))
+        if players is not None:
+            players.close_all(timestamp, "server stopped")
+
+player_sessions = PlayerSessionIndex()
+log_watcher.subscribe(player_sessions.on_log_records)
+stats_history.subscribe(player_sessions.on_stats)
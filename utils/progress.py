@@ -0,0 +1,108 @@
+import asyncio
+from collections import Counter
+import discord
+from utils.server_index import server_index
+
+# Discord allows 5 edits per 5 seconds per message; stay well below that
+EDIT_INTERVAL = 3
+
+# Characters of per-server lines in the embed description
+MAX_DESCRIPTION = 3800
+
+async def send_channel_message(interaction: discord.Interaction, embed):
+    """Post an embed in the interaction's channel with the bot's own token.
+
+    Interaction tokens expire after 15 minutes, so messages that are edited
+    for longer than that (fleet operations, queued backups) must not be
+    followups. Falls back to a followup if the bot cannot post in the channel.
+    """
+    channel = interaction.channel
+    if channel is not None:
+        try:
+            return await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(f"Error posting in channel, falling back to a followup: {e}")
+    return await interaction.followup.send(embed=embed, wait=True)
+
+class ProgressBoard:
+    """One embed that shows the state of many servers during a fleet operation.
+
+    Workers call set() as often as they like. A single updater task edits the
+    message at most every `interval` seconds and only when something changed,
+    so the edit rate does not grow with the number of servers. The board is a
+    channel message, so it can be edited after the interaction token expires.
+    """
+
+    def __init__(self, interaction: discord.Interaction, title, server_ids, initial_state="⏳ Waiting", interval=EDIT_INTERVAL):
+        self.interaction = interaction
+        self.title = title
+        self.interval = interval
+        self.states = {str(server_id): initial_state for server_id in server_ids}
+        self.notes = []
+        self.color = discord.Color.blue()
+        self.dirty = True
+        self.task = None
+        self.message = None
+
+    def set(self, server_id, state):
+        self.states[str(server_id)] = state
+        self.dirty = True
+
+    def note(self, text):
+        """Add a line below the summary, e.g. "Batch 2/5" or an abort reason"""
+        self.notes.append(text)
+        self.dirty = True
+
+    def render(self, footer=None):
+        # Group by the leading emoji, so "❌ Did not stop" and "❌ Not ready" count together
+        summary = " • ".join(f"{icon} {count}" for icon, count in Counter(state.split(" ", 1)[0] for state in self.states.values()).items())
+        lines = []
+        used = 0
+        for server_id, state in self.states.items():
+            name = server_index.get_name(server_id) or f"Server {server_id}"
+            line = f"{state} — **{name}** (`{server_id}`)"
+            if used + len(line) + 1 > MAX_DESCRIPTION:
+                lines.append(f"…and {len(self.states) - len(lines)} more")
+                break
+            lines.append(line)
+            used += len(line) + 1
+
+        embed = discord.Embed(title=self.title, description="\n".join(lines), color=self.color)
+        embed.add_field(name="Summary", value=summary or "Nothing to do", inline=False)
+        if self.notes:
+            embed.add_field(name="Progress", value="\n".join(self.notes[-5:])[:1024], inline=False)
+        if footer:
+            embed.set_footer(text=footer)
+        return embed
+
+    async def start(self):
+        """Send the initial message and start the periodic updater"""
+        self.message = await send_channel_message(self.interaction, self.render())
+        if not isinstance(self.message, discord.WebhookMessage):
+            # Resolve the deferred response with a pointer to the board
+            await self.interaction.followup.send(f"📋 Progress: {self.message.jump_url}")
+        self.dirty = False
+        self.task = asyncio.get_running_loop().create_task(self._update_loop())
+
+    async def _update_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.dirty:
+                self.dirty = False
+                try:
+                    await self.message.edit(embed=self.render())
+                except Exception as e:
+                    print(f"Error updating progress message: {e}")
+
+    async def finish(self, title=None, color=None, footer=None):
+        """Stop the updater and show the final state"""
+        if self.task:
+            self.task.cancel()
+        if title:
+            self.title = title
+        if color:
+            self.color = color
+        try:
+            await self.message.edit(embed=self.render(footer))
+        except Exception as e:
+            print(f"Error updating progress message: {e}")
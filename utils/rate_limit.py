@@ -0,0 +1,153 @@
+import math
+import time
+import discord
+from discord import app_commands
+from utils.api_helper import load_config
+
+# Default bucket sizes; override them with "rate_limits" in config.json
+DEFAULT_LIMITS = {
+    "user": {"capacity": 10, "refill_per_second": 0.2},
+    "guild": {"capacity": 40, "refill_per_second": 1.0},
+    "server": {"capacity": 15, "refill_per_second": 0.25},
+}
+
+# Token cost of each command; override them with "command_costs" in config.json
+DEFAULT_COSTS = {
+    "servers": 5,
+    "serverinfo": 1,
+    "logs": 2,
+    "start": 4,
+    "stop": 3,
+    "backup": 4,
+    "history": 1,
+    "graph": 3,
+    "logsearch": 3,
+    "players": 1,
+    "console": 2,
+    "restart": 5,
+    "stopall": 5,
+}
+
+# Buckets are pruned once there are this many of them
+MAX_BUCKETS = 10000
+
+class TokenBucket:
+    """A classic token bucket that refills continuously up to its capacity"""
+
+    __slots__ = ("capacity", "refill_per_second", "tokens", "updated")
+
+    def __init__(self, capacity, refill_per_second, now):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated = now
+
+    def retry_after(self, cost):
+        """Seconds until `cost` tokens are available, 0 if they already are"""
+        if self.tokens >= cost:
+            return 0.0
+        if cost > self.capacity or self.refill_per_second <= 0:
+            return math.inf
+        return (cost - self.tokens) / self.refill_per_second
+
+class RateLimiter:
+    """Token buckets per user, per guild and per target server"""
+
+    def __init__(self, limits=None, costs=None):
+        self.limits = limits or DEFAULT_LIMITS
+        self.costs = costs or DEFAULT_COSTS
+        self.buckets = {}
+
+    @classmethod
+    def from_config(cls):
+        config = load_config()
+        limits = {scope: dict(values) for scope, values in DEFAULT_LIMITS.items()}
+        for scope, values in config.get("rate_limits", {}).items():
+            limits.setdefault(scope, {}).update(values)
+        costs = dict(DEFAULT_COSTS)
+        costs.update(config.get("command_costs", {}))
+        return cls(limits, costs)
+
+    def cost_of(self, command_name, extra=0):
+        # A command never costs less than one token, whatever its options compute
+        return max(1, self.costs.get(command_name, 1) + extra)
+
+    def _bucket(self, scope, key, now):
+        bucket = self.buckets.get((scope, key))
+        if bucket is None:
+            limit = self.limits[scope]
+            bucket = TokenBucket(limit["capacity"], limit["refill_per_second"], now)
+            self.buckets[(scope, key)] = bucket
+        else:
+            bucket.refill(now)
+        return bucket
+
+    def acquire(self, cost, user_id=None, guild_id=None, server_id=None, now=None):
+        """Take `cost` tokens from every applicable bucket.
+
+        Returns 0 on success, otherwise the number of seconds to wait. Tokens
+        are only taken when all buckets can pay, so a rejected call is free.
+        """
+        if now is None:
+            now = time.monotonic()
+        if len(self.buckets) > MAX_BUCKETS:
+            self.prune(now)
+
+        buckets = []
+        for scope, key in (("user", user_id), ("guild", guild_id), ("server", server_id)):
+            if key is not None and scope in self.limits:
+                buckets.append(self._bucket(scope, key, now))
+
+        wait = max((bucket.retry_after(cost) for bucket in buckets), default=0.0)
+        if wait > 0:
+            return wait
+        for bucket in buckets:
+            bucket.tokens -= cost
+        return 0.0
+
+    def prune(self, now):
+        """Drop buckets that have refilled completely; they are equivalent to new ones"""
+        for key, bucket in list(self.buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self.buckets[key]
+
+rate_limiter = RateLimiter.from_config()
+
+class RateLimited(app_commands.CheckFailure):
+    """Raised by the rate_limited check when a bucket is empty"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        if math.isinf(retry_after):
+            message = "This request is larger than your rate limit allows. Try a smaller request."
+        else:
+            message = f"⏳ Slow down! You can use this command again in {math.ceil(retry_after)}s."
+        super().__init__(message)
+
+def rate_limited(command_name, extra_cost=None):
+    """App command check that charges `command_name`'s cost against the rate limiter.
+
+    `extra_cost` may be a callable taking the interaction namespace and
+    returning additional tokens, e.g. to charge more for large /logs requests.
+    """
+    async def predicate(interaction: discord.Interaction):
+        extra = extra_cost(interaction.namespace) if extra_cost else 0
+        server_id = getattr(interaction.namespace, "server_id", None)
+        retry_after = rate_limiter.acquire(
+            rate_limiter.cost_of(command_name, extra),
+            user_id=interaction.user.id,
+            guild_id=interaction.guild_id,
+            server_id=str(server_id) if server_id is not None else None,
+        )
+        if retry_after > 0:
+            raise RateLimited(retry_after)
+        return True
+
+    return app_commands.check(predicate)
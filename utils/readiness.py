@@ -0,0 +1,63 @@
+import asyncio
+import re
+from utils.api_helper import get_server_logs, get_server_stats
+
+# Logged by Minecraft once the server has finished starting
+DONE_PATTERN = re.compile(r"\[.*?\] \[.*?INFO\].*?Done \(.*?\)! For help, type \"help\"")
+
+def log_shows_ready(log_lines, start=0):
+    """True if the log (from line `start` on) contains the "Done" startup message"""
+    return any(DONE_PATTERN.search(log_lines[index]) for index in range(start, len(log_lines)))
+
+def log_offset(before_lines, log_lines):
+    """Index of the first line appended since `before_lines` was fetched, or 0 if the log was rotated"""
+    if before_lines and log_lines and log_lines[0] == before_lines[0] and len(log_lines) >= len(before_lines):
+        return len(before_lines)
+    return 0
+
+def check_readiness(server_id, before_lines=None):
+    """Fetch a server's logs and stats once.
+
+    Returns (ready, running, logs_data, stats_data). With `before_lines`, only
+    lines logged after that earlier fetch count, so a "Done" from the previous
+    run is not mistaken for the new one. Blocking, run it in a thread.
+    """
+    logs_data = get_server_logs(server_id)
+    stats_data = get_server_stats(server_id)
+
+    ready = False
+    if logs_data.get("status") == "ok":
+        log_lines = logs_data["data"].lines
+        ready = log_shows_ready(log_lines, log_offset(before_lines, log_lines))
+    running = stats_data.get("status") == "ok" and stats_data["data"].running
+    return ready, running, logs_data, stats_data
+
+async def wait_until_ready(server_id, timeout=60, interval=5, before_lines=None):
+    """Poll until the server logs "Done"; False if it does not within `timeout` seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            ready, _, _, _ = await asyncio.to_thread(check_readiness, server_id, before_lines)
+            if ready:
+                return True
+        except Exception as e:
+            print(f"Error checking readiness of server {server_id}: {e}")
+        if loop.time() + interval > deadline:
+            return False
+        await asyncio.sleep(interval)
+
+async def wait_until_stopped(server_id, timeout=60, interval=3):
+    """Poll until the server reports it is no longer running; False on timeout"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            stats_data = await asyncio.to_thread(get_server_stats, server_id)
+            if stats_data.get("status") == "ok" and not stats_data["data"].running:
+                return True
+        except Exception as e:
+            print(f"Error checking status of server {server_id}: {e}")
+        if loop.time() + interval > deadline:
+            return False
+        await asyncio.sleep(interval)
@@ -0,0 +1,130 @@
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import IntEnum
+
+# Worker threads for background polling; kept below the scheduler's background share
+BACKGROUND_THREADS = 4
+
+class Priority(IntEnum):
+    """Priority classes of outbound Crafty requests, lowest value is served first"""
+    INTERACTIVE = 0
+    WATCHER = 1
+    BACKGROUND = 2
+
+# The priority of requests made from the current task or thread. asyncio.to_thread
+# copies the context, so background loops only need to set it once.
+current_priority = contextvars.ContextVar("current_priority", default=Priority.INTERACTIVE)
+
+@contextmanager
+def request_priority(priority):
+    """Run the enclosed Crafty requests with the given priority class"""
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+_background_executor = None
+
+async def run_in_background(func, *args):
+    """Like asyncio.to_thread, but on a small thread pool of its own.
+
+    The default executor is shared with every command, so background loops
+    fanning out there would make interactive requests queue behind them
+    before they ever reach the scheduler.
+    """
+    global _background_executor
+    if _background_executor is None:
+        _background_executor = ThreadPoolExecutor(BACKGROUND_THREADS, thread_name_prefix="background")
+    call = functools.partial(contextvars.copy_context().run, func, *args)
+    return await asyncio.get_running_loop().run_in_executor(_background_executor, call)
+
+class PriorityScheduler:
+    """Global concurrency cap that hands out free slots in priority order.
+
+    Waiting requests are kept in a heap ordered by (priority, arrival), so
+    interactive commands always go before watchers and background refreshes,
+    and requests of the same class are served first come, first served. A
+    few slots can be reserved for interactive requests so that background
+    polling can never occupy the whole pool.
+
+    A request may also name the panel it goes to along with that panel's own
+    limit. A panel at its limit only holds back its own requests: the first
+    waiter in priority order that both the pool and its panel have room for
+    runs, so a slow panel never stalls the others, and a busy panel still
+    serves its interactive requests before its queued background ones.
+    """
+
+    def __init__(self, max_concurrent=8, reserved_interactive=2):
+        self.max_concurrent = max_concurrent
+        self.reserved_interactive = min(reserved_interactive, max_concurrent - 1)
+        self.active = 0
+        self.panel_active = {}
+        self.waiting = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+    def _limit_for(self, priority):
+        if priority == Priority.INTERACTIVE:
+            return self.max_concurrent
+        return self.max_concurrent - self.reserved_interactive
+
+    def _has_room(self, entry):
+        priority, _, panel, panel_limit = entry
+        if self.active >= self._limit_for(priority):
+            return False
+        return panel is None or self.panel_active.get(panel, 0) < panel_limit
+
+    def _can_run(self, entry):
+        if not self._has_room(entry):
+            return False
+        # Nobody ahead of this request may be able to run in its place
+        return not any(other < entry and self._has_room(other) for other in self.waiting)
+
+    def acquire(self, priority=None, panel=None, panel_limit=None):
+        if priority is None:
+            priority = current_priority.get()
+        if panel_limit is None:
+            panel = None
+        entry = (int(priority), next(self.counter), panel, panel_limit)
+        with self.condition:
+            heapq.heappush(self.waiting, entry)
+            while not self._can_run(entry):
+                self.condition.wait()
+            self.waiting.remove(entry)
+            heapq.heapify(self.waiting)
+            self.active += 1
+            if panel is not None:
+                self.panel_active[panel] = self.panel_active.get(panel, 0) + 1
+            # The next waiter may be allowed to run as well
+            self.condition.notify_all()
+
+    def release(self, panel=None):
+        with self.condition:
+            self.active -= 1
+            if panel is not None and panel in self.panel_active:
+                self.panel_active[panel] -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority=None, panel=None, panel_limit=None):
+        """Hold one request slot, and one of `panel`'s `panel_limit` slots when given"""
+        self.acquire(priority, panel, panel_limit)
+        try:
+            yield
+        finally:
+            self.release(panel if panel_limit is not None else None)
+
+    def stats(self):
+        """Number of running requests and waiting requests per priority class"""
+        with self.condition:
+            waiting = {priority.name: 0 for priority in Priority}
+            for entry in self.waiting:
+                waiting[Priority(entry[0]).name] += 1
+            return self.active, waiting
@@ -0,0 +1,38 @@
+import discord
+from discord import app_commands
+from utils.api_helper import load_config
+from utils.server_index import server_index
+
+def get_server_groups():
+    """Named groups of server IDs from the "server_groups" section of config.json"""
+    return {
+        name: [str(server_id) for server_id in server_ids]
+        for name, server_ids in load_config().get("server_groups", {}).items()
+    }
+
+def resolve_targets(value):
+    """Turn a group name, "*" (every known server) or a comma-separated ID list into server IDs"""
+    value = value.strip()
+    groups = get_server_groups()
+    if value in groups:
+        return groups[value]
+    if value == "*":
+        return list(server_index.servers)
+    targets = []
+    for server_id in value.split(","):
+        server_id = server_id.strip()
+        if server_id and server_id not in targets:
+            targets.append(server_id)
+    return targets
+
+async def targets_autocomplete(interaction: discord.Interaction, current: str):
+    """Autocomplete for group-or-IDs parameters: groups first, then matching servers"""
+    current_lower = current.lower()
+    choices = [
+        app_commands.Choice(name=f"Group: {name} ({len(server_ids)} servers)"[:100], value=name)
+        for name, server_ids in get_server_groups().items()
+        if current_lower in name.lower()
+    ]
+    for server_id, server_name in server_index.search(current, limit=25 - len(choices)):
+        choices.append(app_commands.Choice(name=f"{server_name} ({server_id})"[:100], value=server_id))
+    return choices[:25]
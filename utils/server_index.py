@@ -0,0 +1,118 @@
+import asyncio
+import bisect
+import time
+import discord
+from discord import app_commands
+from discord.ext import tasks
+from utils.api_helper import get_all_servers, load_config
+from utils.scheduler import Priority, request_priority
+
+# Discord only shows up to 25 autocomplete choices and 100 characters per choice name
+MAX_CHOICES = 25
+MAX_CHOICE_NAME = 100
+
+class ServerIndex:
+    """In-memory prefix index over server names and IDs used for autocomplete"""
+
+    def __init__(self):
+        self.servers = {}
+        self.keys = []
+        self.last_refresh = 0.0
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """Call listener(servers) with the ServerInfo list every time the index is rebuilt"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def rebuild(self, servers):
+        """Rebuild the index from a list of ServerInfo objects as returned by get_all_servers"""
+        entries = {}
+        keys = []
+        for server in servers:
+            server_id = server.server_id
+            server_name = server.server_name
+            entries[server_id] = server
+
+            # Index the ID, the full name and every word of the name so that
+            # "sur" finds "Survival" and "sur" also finds "Modded Survival"
+            keys.append((server_id.lower(), server_id))
+            lowered = server_name.lower()
+            keys.append((lowered, server_id))
+            for word in lowered.split()[1:]:
+                keys.append((word, server_id))
+        keys.sort()
+
+        # Swap both structures at once so lookups never see a half-built index
+        self.servers, self.keys = entries, keys
+        self.last_refresh = time.time()
+        for listener in self.listeners:
+            try:
+                listener(servers)
+            except Exception as e:
+                print(f"Error in server index listener {getattr(listener, '__name__', listener)}: {e}")
+
+    def export(self):
+        """The indexed servers as a list of ServerInfo objects, e.g. for persistence"""
+        return list(self.servers.values())
+
+    def refresh(self):
+        """Fetch the server list from Crafty and rebuild the index. Blocking."""
+        data = get_all_servers()
+        if data.get("status") != "ok":
+            print(f"Error refreshing server index: {data.get('message', 'Unknown error')}")
+            return False
+        self.rebuild(data.get("data", []))
+        return True
+
+    def search(self, prefix, limit=MAX_CHOICES):
+        """Return up to `limit` (server_id, server_name) pairs matching `prefix`"""
+        if not prefix:
+            return [(server_id, server.server_name) for server_id, server in list(self.servers.items())[:limit]]
+
+        prefix = prefix.lower()
+        keys = self.keys
+        results = []
+        seen = set()
+        position = bisect.bisect_left(keys, (prefix,))
+        while position < len(keys) and len(results) < limit:
+            key, server_id = keys[position]
+            if not key.startswith(prefix):
+                break
+            if server_id not in seen:
+                seen.add(server_id)
+                results.append((server_id, self.servers[server_id].server_name))
+            position += 1
+        return results
+
+    def get_name(self, server_id):
+        """Return the cached display name of a server, or None if it is not indexed"""
+        server = self.servers.get(str(server_id))
+        return server.server_name if server else None
+
+server_index = ServerIndex()
+
+async def server_id_autocomplete(interaction: discord.Interaction, current: str):
+    """Autocomplete callback for `server_id` parameters, served purely from memory"""
+    choices = []
+    for server_id, server_name in server_index.search(current):
+        label = f"{server_name} ({server_id})"
+        if len(label) > MAX_CHOICE_NAME:
+            label = label[:MAX_CHOICE_NAME - 1] + "…"
+        choices.append(app_commands.Choice(name=label, value=server_id))
+    return choices
+
+@tasks.loop(seconds=60)
+async def refresh_server_index():
+    # get_all_servers is blocking, so keep it off the event loop and let
+    # user commands go first when the panel is busy
+    with request_priority(Priority.BACKGROUND):
+        await asyncio.to_thread(server_index.refresh)
+
+def start_server_index():
+    """Start the background refresh loop using the interval from config.json"""
+    if refresh_server_index.is_running():
+        return
+    interval = load_config().get("server_index_refresh_seconds", 60)
+    refresh_server_index.change_interval(seconds=interval)
+    refresh_server_index.start()
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from array import array
+from discord.ext import tasks
+from utils.api_helper import get_server_stats, load_config
+from utils.scheduler import Priority, request_priority, run_in_background
+from utils.server_index import server_index
+
+# Metrics kept for every sample, in storage order
+METRICS = ("cpu", "mem", "mem_percent", "online", "max", "world_size")
+
+# (resolution in seconds, retention in seconds) for each tier, finest first.
+# One hour of raw 10s samples, a day of 1 minute averages and a week of
+# 10 minute averages is about 90KB per server.
+DEFAULT_TIERS = ((10, 3600), (60, 86400), (600, 604800))
+
+# Time windows offered by /history and /graph
+HISTORY_WINDOWS = {"1h": 3600, "24h": 86400, "7d": 604800}
+
+def sample_from_stats(stats):
+    """Extract the numeric metrics from a ServerStats, in METRICS order"""
+    return (
+        float(stats.cpu),
+        float(stats.mem),
+        float(stats.mem_percent),
+        float(stats.online),
+        float(stats.max),
+        float(stats.world_size),
+    )
+
+class HistoryTier:
+    """Fixed-size ring buffers holding one resolution of a server's history.
+
+    Incoming samples are averaged into buckets of `resolution` seconds and a
+    bucket is written to the ring once a sample for a later bucket arrives.
+    """
+
+    __slots__ = ("resolution", "capacity", "timestamps", "values", "head", "count",
+                 "bucket", "bucket_sums", "bucket_count")
+
+    def __init__(self, resolution, retention):
+        self.resolution = resolution
+        self.capacity = max(1, retention // resolution)
+        self.timestamps = array("I", bytes(4 * self.capacity))
+        self.values = [array("f", bytes(4 * self.capacity)) for _ in METRICS]
+        self.head = 0
+        self.count = 0
+        self.bucket = None
+        self.bucket_sums = [0.0] * len(METRICS)
+        self.bucket_count = 0
+
+    def add(self, timestamp, sample):
+        bucket = int(timestamp) // self.resolution
+        if self.bucket is not None and bucket != self.bucket:
+            self._flush()
+        self.bucket = bucket
+        sums = self.bucket_sums
+        for i, value in enumerate(sample):
+            sums[i] += value
+        self.bucket_count += 1
+
+    def _flush(self):
+        if not self.bucket_count:
+            return
+        position = self.head
+        self.timestamps[position] = self.bucket * self.resolution
+        for i, values in enumerate(self.values):
+            values[position] = self.bucket_sums[i] / self.bucket_count
+        self.head = (position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.bucket_sums = [0.0] * len(METRICS)
+        self.bucket_count = 0
+
+    def to_state(self):
+        """Serialize this tier for persistence"""
+        return {
+            "resolution": self.resolution,
+            "capacity": self.capacity,
+            "head": self.head,
+            "count": self.count,
+            "bucket": self.bucket,
+            "bucket_sums": list(self.bucket_sums),
+            "bucket_count": self.bucket_count,
+            "timestamps": self.timestamps.tobytes(),
+            "values": b"".join(values.tobytes() for values in self.values),
+        }
+
+    def load_state(self, state):
+        """Restore a tier serialized with to_state. Returns False if the layout differs."""
+        if state["resolution"] != self.resolution or state["capacity"] != self.capacity:
+            return False
+        timestamps = array("I")
+        timestamps.frombytes(state["timestamps"])
+        values = array("f")
+        values.frombytes(state["values"])
+        if len(timestamps) != self.capacity or len(values) != self.capacity * len(METRICS):
+            return False
+        self.timestamps = timestamps
+        self.values = [values[i * self.capacity:(i + 1) * self.capacity] for i in range(len(METRICS))]
+        self.head = state["head"]
+        self.count = state["count"]
+        self.bucket = state["bucket"]
+        self.bucket_sums = list(state["bucket_sums"])
+        self.bucket_count = state["bucket_count"]
+        return True
+
+    @property
+    def retention(self):
+        return self.capacity * self.resolution
+
+    def series(self, metric_index, since):
+        """Chronological (timestamps, values) of the stored points newer than `since`"""
+        timestamps = []
+        values = []
+        start = (self.head - self.count) % self.capacity
+        metric_values = self.values[metric_index]
+        for offset in range(self.count):
+            position = (start + offset) % self.capacity
+            if self.timestamps[position] >= since:
+                timestamps.append(self.timestamps[position])
+                values.append(metric_values[position])
+        # Include the bucket that is still being filled so fresh data shows up
+        if self.bucket_count and self.bucket * self.resolution >= since:
+            timestamps.append(self.bucket * self.resolution)
+            values.append(self.bucket_sums[metric_index] / self.bucket_count)
+        return timestamps, values
+
+    def nbytes(self):
+        return self.timestamps.itemsize * self.capacity + sum(
+            values.itemsize * self.capacity for values in self.values
+        )
+
+class ServerHistory:
+    """All resolution tiers of one server"""
+
+    __slots__ = ("tiers",)
+
+    def __init__(self, tiers):
+        self.tiers = [HistoryTier(resolution, retention) for resolution, retention in tiers]
+
+    def add(self, timestamp, sample):
+        # Every tier sees every sample and averages it into its own buckets,
+        # so older data automatically survives only at coarser resolutions
+        for tier in self.tiers:
+            tier.add(timestamp, sample)
+
+    def series(self, metric, window, now=None):
+        """(timestamps, values) of `metric` over the last `window` seconds.
+
+        Uses the finest tier that still covers the whole window.
+        """
+        if now is None:
+            now = time.time()
+        metric_index = METRICS.index(metric)
+        tier = next((tier for tier in self.tiers if tier.retention >= window), self.tiers[-1])
+        return tier.series(metric_index, int(now - window))
+
+    def nbytes(self):
+        return sum(tier.nbytes() for tier in self.tiers)
+
+class StatsHistory:
+    """Per-server stats history plus the latest ServerStats of every server"""
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tier_config = tuple(tuple(tier) for tier in tiers)
+        self.servers = {}
+        self.latest = {}
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """Call listener(server_id, previous, stats, timestamp) for every recorded sample.
+
+        `previous` is the earlier (timestamp, stats) entry of the server, or None.
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    @classmethod
+    def from_config(cls):
+        history_config = load_config().get("stats_history", {})
+        return cls(history_config.get("tiers", DEFAULT_TIERS))
+
+    def record(self, server_id, stats, timestamp=None):
+        """Store one ServerStats sample for a server"""
+        if timestamp is None:
+            timestamp = time.time()
+        server_id = str(server_id)
+        previous = self.latest.get(server_id)
+        self.latest[server_id] = (timestamp, stats)
+        for listener in self.listeners:
+            try:
+                listener(server_id, previous, stats, timestamp)
+            except Exception as e:
+                print(f"Error in stats listener {getattr(listener, '__name__', listener)}: {e}")
+
+        history = self.servers.get(server_id)
+        if history is None:
+            history = self.servers[server_id] = ServerHistory(self.tier_config)
+        history.add(timestamp, sample_from_stats(stats))
+
+    def get(self, server_id):
+        return self.servers.get(str(server_id))
+
+    def restore(self, server_id, tier_states):
+        """Restore a server's tiers from persisted states, skipping tiers whose layout changed"""
+        history = self.servers.get(server_id)
+        if history is None:
+            history = self.servers[server_id] = ServerHistory(self.tier_config)
+        for tier, state in zip(history.tiers, tier_states):
+            tier.load_state(state)
+
+    def get_latest(self, server_id, max_age=None):
+        """Latest (timestamp, stats) of a server, or None if missing or older than max_age"""
+        entry = self.latest.get(str(server_id))
+        if entry is None or (max_age is not None and time.time() - entry[0] > max_age):
+            return None
+        return entry
+
+    def forget(self, server_ids):
+        """Drop servers that no longer exist"""
+        for server_id in server_ids:
+            self.servers.pop(server_id, None)
+            self.latest.pop(server_id, None)
+
+    def nbytes(self):
+        return sum(history.nbytes() for history in self.servers.values())
+
+stats_history = StatsHistory.from_config()
+
+async def collect_stats():
+    """Fetch stats of every indexed server concurrently and record them"""
+    server_ids = list(server_index.servers)
+    if not server_ids:
+        return
+
+    with request_priority(Priority.BACKGROUND):
+        results = await asyncio.gather(
+            *(run_in_background(get_server_stats, server_id) for server_id in server_ids)
+        )
+
+    now = time.time()
+    for server_id, data in zip(server_ids, results):
+        if data.get("status") == "ok":
+            stats_history.record(server_id, data["data"], now)
+
+    stale = set(stats_history.servers) - set(server_index.servers)
+    if stale and server_index.servers:
+        stats_history.forget(stale)
+
+@tasks.loop(seconds=10)
+async def stats_collector():
+    try:
+        await collect_stats()
+    except Exception as e:
+        print(f"Error collecting server stats: {e}")
+
+def start_stats_collector():
+    """Start the background stats sampler using the interval from config.json"""
+    if stats_collector.is_running():
+        return
+    interval = load_config().get("stats_history", {}).get("sample_interval_seconds", 10)
+    stats_collector.change_interval(seconds=interval)
+    stats_collector.start()
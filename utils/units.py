@@ -0,0 +1,51 @@
+import re
+
+# Crafty reports sizes like "1.6GB" or "185.4MB" using binary multiples
+SIZE_PATTERN = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([KMGTP]?i?B?)\s*$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5}
+
+def parse_size(value, default=None):
+    """Convert a Crafty size string like "185.4MB" into a number of bytes"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if not isinstance(value, str):
+        return default
+    match = SIZE_PATTERN.match(value)
+    if not match:
+        return default
+    unit = match.group(2).upper().replace("I", "").rstrip("B") or "B"
+    return int(float(match.group(1)) * SIZE_UNITS[unit])
+
+def format_size(num_bytes):
+    """Format a number of bytes the way Crafty does, e.g. 1.6GB"""
+    if num_bytes is None:
+        return "Unknown"
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size) < 1024 or unit == "TB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([smhd])", re.IGNORECASE)
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_duration(value):
+    """Convert a duration like "10m", "1h30m" or "90" (seconds) into seconds, or None"""
+    value = value.strip().lower()
+    if value.isdigit():
+        return int(value)
+    matches = DURATION_PATTERN.findall(value)
+    if not matches or DURATION_PATTERN.sub("", value).strip():
+        return None
+    return int(sum(float(amount) * DURATION_UNITS[unit] for amount, unit in matches))
+
+def parse_time_of_day(value):
+    """Convert "HH:MM" or "HH:MM:SS" into seconds since midnight, or None"""
+    parts = value.strip().split(":")
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts):
+        return None
+    hours, minutes = int(parts[0]), int(parts[1])
+    seconds = int(parts[2]) if len(parts) == 3 else 0
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return None
+    return hours * 3600 + minutes * 60 + seconds